@@ -0,0 +1,245 @@
+"""Storage and dedup benchmarks on synthetic offer histories.
+
+Usage:
+    python -m benchmarks.storage_bench --rows 10000 100000 --output bench.json
+
+Each run seeds a fresh temporary data directory per backend and history size,
+then prints (or writes) one JSON document with all timings.
+"""
+import argparse
+import asyncio
+import json
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Callable, Dict
+
+from src.config.settings import settings
+from src.models.offer import Offer
+from src.services.offer_service import OfferService
+from src.services.seen_set import SeenSet
+from src.services.seen_snapshot import SeenSnapshot
+from src.storage.base import BaseStorage
+from src.storage.buffered_storage import BufferedStorage
+from src.storage.csv_storage import CSVStorage
+from src.storage.sqlite_storage import SQLiteStorage
+
+SOURCES = ["otomoto", "lento", "autoplac", "sprzedajemy"]
+
+MAKES = {
+    "Opel": ["Astra", "Corsa", "Vectra", "Zafira", "Meriva"],
+    "Volkswagen": ["Golf", "Passat", "Polo", "Touran", "Bora"],
+    "Ford": ["Focus", "Fiesta", "Mondeo", "Fusion", "C-Max"],
+    "Škoda": ["Octavia", "Fabia", "Superb", "Roomster"],
+    "Toyota": ["Corolla", "Yaris", "Avensis", "Auris"],
+    "Renault": ["Clio", "Mégane", "Scénic", "Kangoo"],
+    "Fiat": ["Punto", "Panda", "Bravo", "Stilo", "Grande Punto"],
+    "Peugeot": ["206", "207", "307", "308", "Partner"],
+}
+ENGINES = ["1.2", "1.4", "1.6", "1.9 TDI", "2.0 HDi", "1.4 16V", "1.6 benzyna+LPG"]
+EXTRAS = [
+    "zadbany", "bezwypadkowy", "klimatyzacja", "okazja", "pierwszy właściciel",
+    "serwisowany", "stan bardzo dobry", "zamiana", "hak", "nowe opony", "sprowadzony",
+    "salon Polska", "mały przebieg", "do jazdy", "pilnie sprzedam",
+]
+CITIES = ["Siedlce", "Łódź", "Białystok", "Lublin", "Mińsk Mazowiecki", "Sokołów Podlaski", "Węgrów"]
+
+BACKENDS: Dict[str, Callable[[], BaseStorage]] = {
+    "csv": CSVStorage,
+    "sqlite": SQLiteStorage,
+    "buffered_csv": lambda: BufferedStorage(CSVStorage()),
+    "buffered_sqlite": lambda: BufferedStorage(SQLiteStorage()),
+}
+
+
+def make_offer(rng: random.Random, index: int) -> Offer:
+    """Build synthetic offer with a Polish title and stable listing ID."""
+    make = rng.choice(list(MAKES))
+    words = [make, rng.choice(MAKES[make]), rng.choice(ENGINES)]
+    words += rng.sample(EXTRAS, rng.randint(0, 3))
+    if rng.random() < 0.3:
+        words.append(rng.choice(CITIES))
+    price_value = rng.randrange(2000, 13001, 100)
+    source = SOURCES[index % len(SOURCES)]
+    return Offer(
+        title=" ".join(words),
+        price=f"{price_value:,}".replace(",", " ") + " zł",
+        url=f"https://example.pl/{source}/oferta-{index}.html",
+        publication_time=f"{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}",
+        source=source,
+        listing_id=str(index),
+        price_value=price_value,
+    )
+
+
+async def seed(storage: BaseStorage, rows: int, days: int, seed_value: int, chunk_size: int = 50000) -> None:
+    """Write synthetic history spread evenly over the last days."""
+    rng = random.Random(seed_value)
+    today = date.today()
+    per_day = max(1, rows // days)
+
+    index = 0
+    for day_offset in range(days - 1, -1, -1):
+        day = today - timedelta(days=day_offset)
+        day_rows = per_day if day_offset else rows - index
+        while day_rows > 0:
+            count = min(chunk_size, day_rows)
+            await storage.import_offers(day, [make_offer(rng, index + i) for i in range(count)])
+            index += count
+            day_rows -= count
+
+
+async def timed(coro) -> float:
+    """Await coroutine and get elapsed seconds."""
+    start = time.perf_counter()
+    await coro
+    return time.perf_counter() - start
+
+
+async def bench_backend(name: str, rows: int, days: int, args) -> dict:
+    """Run all measurements for one backend and history size."""
+    result = {"backend": name, "rows": rows, "days": days}
+
+    with tempfile.TemporaryDirectory(prefix="bench-") as tmp:
+        settings.data_dir = Path(tmp)
+        storage = BACKENDS[name]()
+        result["seed_seconds"] = await timed(seed(storage, rows, days, args.seed))
+        await storage.close()
+
+        # Cold start: fresh storage, full seen-set load without snapshot
+        settings.seen_snapshot = False
+        start = time.perf_counter()
+        storage = BACKENDS[name]()
+        service = OfferService(storage)
+        await service.refresh_cache()
+        result["cold_start_seconds"] = time.perf_counter() - start
+        result["seen_keys"] = len(service._sent_offers_cache)
+
+        result["load_offers_today_seconds"] = await timed(storage.load_offers())
+
+        # filter_new_offers throughput on a batch that is half sent, half new
+        rng = random.Random(args.seed + 1)
+        batch = [make_offer(rng, rng.randrange(rows)) for _ in range(args.filter_batch // 2)]
+        batch += [make_offer(rng, rows + i) for i in range(args.filter_batch - len(batch))]
+        rng.shuffle(batch)
+        targets = {offer.unique_key: {None} for offer in batch}
+        start = time.perf_counter()
+        new_offers = service.filter_new_offers(batch, targets)
+        elapsed = time.perf_counter() - start
+        result["filter_new_offers"] = {
+            "batch": len(batch),
+            "new": len(new_offers),
+            "seconds": elapsed,
+            "offers_per_second": len(batch) / elapsed if elapsed else None,
+        }
+
+        # Save path: per-source batches of one cycle, then one flush
+        save_batches = [
+            [make_offer(rng, rows * 2 + cycle * 1000 + i) for i in range(args.save_batch)]
+            for cycle in range(args.save_cycles)
+        ]
+        start = time.perf_counter()
+        for offers in save_batches:
+            for source_offers in (offers[i::len(SOURCES)] for i in range(len(SOURCES))):
+                await storage.save_offers(source_offers)
+            await storage.flush()
+        elapsed = time.perf_counter() - start
+        result["save_offers"] = {
+            "cycles": args.save_cycles,
+            "offers_per_cycle": args.save_batch,
+            "seconds": elapsed,
+            "offers_per_second": args.save_cycles * args.save_batch / elapsed if elapsed else None,
+        }
+
+        # Warm start from snapshot plus log tail
+        SeenSnapshot().save(service._sent_offers_cache, await storage.log_position())
+        await storage.close()
+        settings.seen_snapshot = True
+        start = time.perf_counter()
+        storage = BACKENDS[name]()
+        warm = OfferService(storage)
+        await warm.refresh_cache()
+        result["warm_start_seconds"] = time.perf_counter() - start
+
+        # Memory of the seen-set alone: what stays after the loaded history is
+        # dropped, and the peak while building it from that history
+        seen = SeenSet(days)
+        tracemalloc.start()
+        history = await storage.load_offer_history(seen.first_day)
+        for day, keys in history.items():
+            seen.add_many(keys, day)
+        del history
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        result["seen_set_memory_bytes"] = {"retained": current, "peak_while_loading": peak, "keys": len(seen)}
+        del seen
+
+        result["cleanup_seconds"] = await timed(storage.cleanup_old_offers(max(1, days // 2)))
+        await storage.close()
+
+    return result
+
+
+def git_revision() -> str:
+    """Get commit the benchmark ran against, if known."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args) -> dict:
+    """Run benchmarks for all requested backends and sizes."""
+    # Benchmark storage and the seen-set only
+    settings.cross_source_dedup = False
+    settings.image_dedup = False
+    settings.price_drop_alerts = False
+    settings.seen_window_days = args.days
+
+    results = []
+    for rows in args.rows:
+        for backend in args.backends:
+            print(f"Benchmarking {backend} with {rows} rows...", file=sys.stderr)
+            results.append(await bench_backend(backend, rows, args.days, args))
+
+    return {
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "started_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results,
+    }
+
+
+def main() -> None:
+    """Parse arguments, run benchmarks and emit JSON."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000],
+                        help="history sizes to benchmark (e.g. 10000 1000000 10000000)")
+    parser.add_argument("--days", type=int, default=14, help="days the history spans")
+    parser.add_argument("--backends", nargs="+", choices=list(BACKENDS), default=list(BACKENDS))
+    parser.add_argument("--filter-batch", type=int, default=100_000, help="offers per filter_new_offers call")
+    parser.add_argument("--save-batch", type=int, default=200, help="offers saved per cycle")
+    parser.add_argument("--save-cycles", type=int, default=20, help="save cycles to time")
+    parser.add_argument("--seed", type=int, default=42, help="random seed of synthetic data")
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(payload + "\n", encoding="utf-8")
+    else:
+        print(payload)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Background delivery of queued messages to Discord."""
+import asyncio
+import logging
+import random
+from typing import Awaitable, Callable, List, Optional, Set
+
+import aiohttp
+import discord
+
+from src.models.offer import Offer
+from src.services.offer_service import OfferService
+from src.services.outbox import Outbox, OutboxEntry, KIND_OFFER
+from src.utils.rate_limiter import TokenBucket
+from src.config.settings import settings
+
+
+class OutboxDispatcher:
+    """Drains the outbox into Discord, marking offers as sent only after delivery."""
+
+    def __init__(
+            self,
+            outbox: Outbox,
+            offer_service: OfferService,
+            send_offers: Callable[[List[Offer], Optional[str]], Awaitable[None]],
+            send_price_drop: Callable[[Offer, int, Optional[str]], Awaitable[None]],
+            batch_size: int = 10
+    ):
+        """Initialize dispatcher with message senders."""
+        self.outbox = outbox
+        self.offer_service = offer_service
+        self.send_offers = send_offers
+        self.send_price_drop = send_price_drop
+        self.batch_size = batch_size
+        self.logger = logging.getLogger(__name__)
+        self.running = False
+        # discord.py waits out 429s per route; this keeps us under the channel's message bucket
+        self._bucket = TokenBucket(
+            rate=settings.discord_messages_per_second,
+            capacity=settings.discord_message_burst
+        )
+        self._failures = 0
+        # Entries of batches Discord rejected, delivered one per message
+        self._isolated: Set[int] = set()
+
+    async def run(self) -> None:
+        """Deliver queued messages until stopped."""
+        self.running = True
+        while self.running:
+            try:
+                await self._dispatch_next()
+            except Exception as e:
+                # Keep delivering; whatever failed stays queued for the next attempt
+                self.logger.error(f"Dispatcher error: {e}", exc_info=True)
+                await self._back_off(e)
+
+    async def _dispatch_next(self) -> None:
+        """Deliver next batch of queued messages, or wait for one."""
+        batch = self.outbox.peek(self.batch_size)
+        if not batch:
+            await self.outbox.wait()
+            return
+        if batch[0].kind != KIND_OFFER:
+            # Only offers are packed together into one message
+            batch = batch[:1]
+        isolated = next((i for i, entry in enumerate(batch) if entry.id in self._isolated), None)
+        if isolated is not None:
+            # Entries of a rejected batch go one per message to find the bad one
+            batch = batch[:max(isolated, 1)]
+
+        await self._bucket.acquire()
+        try:
+            await self._deliver(batch)
+        except LookupError as e:
+            # Target channel is gone or not visible to the bot; keep entries queued until it is
+            self.logger.error(f"Cannot deliver {len(batch)} messages, they stay queued: {e}")
+            await self._back_off(e)
+        except discord.HTTPException as e:
+            if e.status in (400, 413):
+                if len(batch) > 1:
+                    self.logger.warning(f"Discord rejected {len(batch)} offers, retrying one by one: {e}")
+                    self._isolated.update(entry.id for entry in batch)
+                else:
+                    # Discord rejected the message itself; retrying can't help
+                    self.logger.error(f"Dropping undeliverable message of {batch[0].offer.url}: {e}")
+                    await self._complete(batch)
+            else:
+                if e.status in (401, 403, 404):
+                    # Lost permission or deleted channel/webhook; keep everything queued until fixed
+                    self.logger.critical(
+                        f"Discord refused delivery ({e.status}), {len(self.outbox)} messages stay queued: {e}"
+                    )
+                await self._back_off(e)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            await self._back_off(e)
+        else:
+            self._failures = 0
+            await self._complete(batch)
+
+    async def _complete(self, batch: List[OutboxEntry]) -> None:
+        """Record offers as sent to the batch's target, then acknowledge entries.
+
+        History rows reach storage before the acknowledgement, so a crash in
+        between re-sends this batch at most.
+        """
+        offers = [entry.offer for entry in batch if entry.kind == KIND_OFFER]
+
+        if offers:
+            try:
+                await self.offer_service.mark_as_sent(offers, batch[0].target)
+                await self.offer_service.storage.flush()
+            except Exception as e:
+                # Offers are in the seen-set already; a buffered batch is retried by the next flush
+                self.logger.error(f"Failed to record {len(offers)} delivered offers: {e}", exc_info=True)
+
+        await self.outbox.ack(batch)
+        self._isolated.difference_update(entry.id for entry in batch)
+
+    async def _deliver(self, batch: List[OutboxEntry]) -> None:
+        """Send batch of same-kind entries to their common target."""
+        target = batch[0].target
+        if batch[0].kind == KIND_OFFER:
+            await self.send_offers([entry.offer for entry in batch], target)
+        else:
+            await self.send_price_drop(batch[0].offer, batch[0].old_price, target)
+
+    async def _back_off(self, error: Exception) -> None:
+        """Wait with capped exponential backoff and full jitter before retrying."""
+        self._failures += 1
+        delay = min(settings.discord_retry_max_delay_seconds, 2 ** self._failures)
+        self.logger.warning(f"Discord delivery failed ({error}), retrying in up to {delay}s")
+        await asyncio.sleep(random.uniform(0, delay))
+
+    def stop(self) -> None:
+        """Stop after the current delivery."""
+        self.running = False
@@ -2,71 +2,213 @@
 import asyncio
 import logging
 from datetime import date
-from typing import List, Dict
+from typing import List, Dict, Optional, Set
 import discord
 
 from src.bot.client import OfferBot
+from src.bot.dispatcher import OutboxDispatcher
+from src.bot.status import StatusReporter
+from src.bot.webhook import WebhookChannel
 from src.services.offer_service import OfferService
+from src.services.outbox import OutboxEntry, KIND_OFFER, KIND_PRICE_DROP
 from src.services.scraper_service import ScraperService
+from src.services.scheduler import AdaptiveScheduler
+from src.services.subscriptions import SubscriptionRegistry
+from src.storage.buffered_storage import BufferedStorage
 from src.storage.csv_storage import CSVStorage
-from src.models.offer import Offer
+from src.storage.sqlite_storage import SQLiteStorage
+from src.models.offer import Offer, normalize_source
 from src.config.settings import settings
 from src.config.constants import MessageTemplate, ScraperName
 from src.utils.logger import DiscordLogger
-from src.utils.decorators import measure_time, async_retry_on_failure
+from src.utils.decorators import measure_time
+from src.utils.text import format_price
+
+
+# Discord limits: embeds per message and characters of embed title
+EMBEDS_PER_MESSAGE = 10
+EMBED_TITLE_LIMIT = 256
 
 
 class OfferHandler:
     """Handler for processing and sending offers."""
 
-    def __init__(self, bot: OfferBot):
-        """Initialize offer handler."""
+    def __init__(self, bot: Optional[OfferBot] = None):
+        """Initialize offer handler (without bot when delivering through a webhook)."""
         self.bot = bot
+        self.channel: discord.TextChannel = None
         self.logger = logging.getLogger(__name__)
         self.discord_logger: DiscordLogger = None
+        self.status_reporter: StatusReporter = None
 
         # Initialize services
-        storage = CSVStorage()
+        storage = SQLiteStorage() if settings.storage_backend == "sqlite" else CSVStorage()
+        if settings.storage_write_buffer:
+            storage = BufferedStorage(
+                storage,
+                max_delay_seconds=settings.storage_flush_delay_seconds,
+                durability=settings.storage_durability,
+                fsync_interval_seconds=settings.storage_fsync_interval_seconds
+            )
         self.offer_service = OfferService(storage)
         self.scraper_service = ScraperService()
+        self.scheduler = AdaptiveScheduler(self.scraper_service.scrapers)
+        self.subscriptions = SubscriptionRegistry.from_settings()
+        self._webhooks: Dict[str, WebhookChannel] = {}
+        self.dispatcher = OutboxDispatcher(
+            outbox=self.offer_service.outbox,
+            offer_service=self.offer_service,
+            send_offers=self.send_offers,
+            send_price_drop=self.send_price_drop_message,
+            batch_size=1 if settings.delivery_mode == "text" else EMBEDS_PER_MESSAGE
+        )
 
         # State
         self.last_reset_date = date.today()
         self.running = False
+        self.dispatcher_task: Optional[asyncio.Task] = None
 
     async def initialize(self, channel: discord.TextChannel) -> None:
-        """Initialize handler with Discord channel."""
+        """Initialize handler with Discord channel (or webhook channel)."""
+        self.channel = channel
         self.discord_logger = DiscordLogger(channel)
+        self.status_reporter = StatusReporter(channel, settings.status_min_interval_seconds)
+        self.validate_subscriptions()
         await self.offer_service.initialize()
 
-        # Start auto-fetch task
+        # Start delivery and auto-fetch tasks
         self.running = True
+        self._start_dispatcher()
         asyncio.create_task(self.auto_fetch_loop(channel))
 
+    def _start_dispatcher(self) -> None:
+        """Run dispatcher task, restarting it if it dies."""
+        self.dispatcher_task = asyncio.create_task(self.dispatcher.run())
+        self.dispatcher_task.add_done_callback(self._on_dispatcher_done)
+
+    def _on_dispatcher_done(self, task: asyncio.Task) -> None:
+        """Restart dispatcher that failed while the handler still runs."""
+        if task.cancelled() or not self.running:
+            return
+        error = task.exception()
+        if error is not None:
+            self.logger.error(f"Dispatcher crashed, restarting: {error}", exc_info=error)
+            self._start_dispatcher()
+
     @measure_time
     async def process_source(
             self,
             source_name: str,
-            offers: List[Offer]
+            offers: List[Offer],
+            targets: Dict[int, Set[Optional[str]]]
     ) -> int:
-        """Process offers from a single source."""
-        # Filter new offers
-        new_offers = self.offer_service.filter_new_offers(offers)
+        """Process offers from a single source, queueing each for subscribed targets it wasn't sent to."""
+        # Announce price drops to targets that got the offer earlier
+        entries = [
+            OutboxEntry(kind=KIND_PRICE_DROP, offer=offer, old_price=old_price, target=target)
+            for offer, old_price in self.offer_service.find_price_drops(offers)
+            for target in targets[offer.unique_key]
+            if self.offer_service.was_sent(offer, target)
+        ]
+
+        # Keep offers and targets they weren't sent or queued to
+        new_offers = self.offer_service.filter_new_offers(offers, targets)
 
         if not new_offers:
+            await self.offer_service.outbox.put(entries)
             return 0
 
-        # Send offers to Discord
-        for offer in new_offers:
-            await self.send_offer_message(offer)
+        # Suppress cars targets already got from another marketplace or with the same photos
+        unique_offers, duplicates = await self.offer_service.split_cross_source_duplicates(new_offers, targets)
+        unique_offers, reposts = await self.offer_service.split_image_duplicates(unique_offers, targets)
+        duplicates += reposts
+
+        # Queue offers for the dispatcher, which marks each as sent to its target once delivered;
+        # grouped by target so batches fill up, and journaled in one write
+        by_target: Dict[Optional[str], List[Offer]] = {}
+        for offer in unique_offers:
+            for target in targets[offer.unique_key]:
+                by_target.setdefault(target, []).append(offer)
+        entries += [
+            OutboxEntry(kind=KIND_OFFER, offer=offer, target=target)
+            for target, target_offers in by_target.items()
+            for offer in target_offers
+        ]
+        await self.offer_service.outbox.put(entries)
+
+        # Suppressed duplicates are never sent; mark them so they aren't rechecked
+        suppressed: Dict[Optional[str], List[Offer]] = {}
+        for offer, target in duplicates:
+            suppressed.setdefault(target, []).append(offer)
+        for target, target_offers in suppressed.items():
+            await self.offer_service.mark_as_sent(target_offers, target, delivered=False)
+
+        return len(unique_offers)
+
+    def resolve_channel(self, target: Optional[str] = None):
+        """Get channel of delivery target: webhook URL, channel ID, or None for the default channel."""
+        if target is None:
+            return self.channel
+        if target.startswith("https://"):
+            if target not in self._webhooks:
+                self._webhooks[target] = WebhookChannel(target)
+            return self._webhooks[target]
 
-        # Mark as sent
-        await self.offer_service.mark_as_sent(new_offers)
+        channel = self.bot.get_channel(int(target)) if self.bot else None
+        if channel is None:
+            raise LookupError(f"Channel {target} not found")
+        return channel
 
-        return len(new_offers)
+    def validate_subscriptions(self) -> None:
+        """Reject subscriptions whose target can't be reached under the active transport."""
+        unreachable = []
+        for subscription in self.subscriptions.subscriptions:
+            try:
+                self.resolve_channel(subscription.target)
+            except LookupError:
+                unreachable.append(subscription.name)
+
+        if unreachable:
+            raise ValueError(
+                f"Subscription targets unreachable with {settings.discord_transport} transport: "
+                + ", ".join(unreachable)
+            )
 
-    async def send_offer_message(self, offer: Offer) -> None:
-        """Send single offer to Discord channel."""
+    async def send_offers(self, offers: List[Offer], target: Optional[str] = None) -> None:
+        """Send offers to target channel in the configured delivery mode."""
+        channel = self.resolve_channel(target)
+        if settings.delivery_mode == "text":
+            for offer in offers:
+                await self.send_offer_message(offer, channel)
+            return
+
+        for start in range(0, len(offers), EMBEDS_PER_MESSAGE):
+            embeds = [self.build_offer_embed(offer) for offer in offers[start:start + EMBEDS_PER_MESSAGE]]
+            await channel.send(embeds=embeds)
+
+    def build_offer_embed(self, offer: Offer) -> discord.Embed:
+        """Build rich embed of single offer."""
+        embed = discord.Embed(title=offer.title[:EMBED_TITLE_LIMIT], url=offer.url)
+        embed.add_field(name=MessageTemplate.EMBED_PRICE_FIELD, value=offer.price or "—")
+        if offer.publication_time:
+            embed.add_field(
+                name=MessageTemplate.EMBED_PUBLICATION_TIME_FIELD,
+                value=offer.publication_time
+            )
+        embed.add_field(
+            name=MessageTemplate.EMBED_LINK_FIELD,
+            value=f"[{MessageTemplate.EMBED_LINK_TEXT}]({offer.url})",
+            inline=False
+        )
+        if offer.thumbnail_url:
+            embed.set_thumbnail(url=offer.thumbnail_url)
+        if offer.source:
+            source_name = self.get_source_display_name(normalize_source(offer.source))
+            embed.set_footer(text=getattr(source_name, "value", source_name))
+        return embed
+
+    async def send_offer_message(self, offer: Offer, channel=None) -> None:
+        """Send single offer to Discord channel (default: the bot's channel)."""
         # Build publication time line if available
         pub_time_line = ""
         if offer.publication_time:
@@ -82,50 +224,80 @@ class OfferHandler:
             url=offer.url
         )
 
-        await self.bot.channel.send(message)
+        await (channel or self.channel).send(message)
+
+    async def send_price_drop_message(self, offer: Offer, old_price: int, target: Optional[str] = None) -> None:
+        """Send price drop notice of already sent offer to target channel."""
+        message = MessageTemplate.PRICE_DROP_MESSAGE.format(
+            title=offer.title,
+            old_price=format_price(old_price),
+            price=format_price(offer.price_value),
+            url=offer.url
+        )
+
+        await self.resolve_channel(target).send(message)
 
-    @async_retry_on_failure(max_attempts=3, delay=2.0)
-    async def fetch_and_process_all(self) -> None:
-        """Fetch and process offers from all sources."""
+    def is_seen(self, offer: Offer) -> bool:
+        """Check if a previous cycle got offer to any subscription, so later pages are older still."""
+        return any(self.offer_service.is_seen(offer, target) for target in self.subscriptions.all_targets())
+
+    async def fetch_and_process_all(self, sources: List[str] = None) -> None:
+        """Fetch and process offers from all (or given) sources."""
         # Check for daily reset
         await self.check_daily_reset()
 
-        # Fetch offers from all sources
-        all_offers = await self.scraper_service.scrape_all()
+        # Fetch each distinct subscription query once per source
+        all_offers = await self.scraper_service.scrape_queries(
+            self.subscriptions.queries(),
+            is_seen=self.is_seen,
+            sources=sources
+        )
 
-        # Process each source
-        for source, offers in all_offers.items():
+        # Process each source, fanning offers out to matching subscriptions
+        for source, offers_by_query in all_offers.items():
+            offers, targets = self.subscriptions.route(offers_by_query)
             source_name = self.get_source_display_name(source)
+            stats = self.scraper_service.stats.get(source)
+            error = stats.error if stats else None
 
-            await self.discord_logger.log(
-                MessageTemplate.CHECKING_SOURCE.format(source=source_name)
-            )
-
+            count = 0
             try:
-                count = await self.process_source(source_name, offers)
-
-                await self.discord_logger.log(
-                    MessageTemplate.NEW_OFFERS_SENT.format(
-                        count=count,
-                        source=source_name
-                    )
-                )
+                count = await self.process_source(source_name, offers, targets)
+                self.scraper_service.commit_pages(source)
             except Exception as e:
-                await self.discord_logger.log(
-                    MessageTemplate.ERROR_FETCHING.format(
-                        source=source_name,
-                        error=str(e)
-                    ),
-                    emoji="❌"
+                self.scraper_service.discard_pages(source)
+                self.logger.error(
+                    MessageTemplate.ERROR_FETCHING.format(source=source_name, error=str(e)),
+                    exc_info=True
                 )
+                error = str(e) or type(e).__name__
+
+            self.scheduler.record(source, count)
+            self.status_reporter.record(
+                source,
+                name=getattr(source_name, "value", source_name),
+                scraped=sum(len(query_offers) for query_offers in offers_by_query.values()),
+                new=count,
+                seconds=stats.seconds if stats else 0.0,
+                error=error
+            )
+
+        # Group-commit offers marked as sent by all sources
+        await self.offer_service.checkpoint()
+
+        # One debounced status edit per cycle instead of messages per source
+        self.status_reporter.queued = len(self.offer_service.outbox)
+        await self.status_reporter.publish()
 
     async def check_daily_reset(self) -> None:
-        """Check if we need to reset for a new day."""
+        """Check if a new day started and expire the oldest sent offers."""
         today = date.today()
         if today != self.last_reset_date:
             self.last_reset_date = today
             await self.offer_service.refresh_cache()
-            await self.discord_logger.log(MessageTemplate.DAILY_RESET)
+            await self.discord_logger.log(
+                MessageTemplate.SEEN_WINDOW_ROTATED.format(days=settings.seen_window_days)
+            )
 
             # Cleanup old data weekly
             if today.weekday() == 0:  # Monday
@@ -144,13 +316,31 @@ class OfferHandler:
     async def auto_fetch_loop(self, channel: discord.TextChannel) -> None:
         """Main loop for auto-fetching offers."""
         while self.running:
-            try:
-                await self.fetch_and_process_all()
-            except Exception as e:
-                self.logger.error(f"Error in auto-fetch loop: {e}", exc_info=True)
+            due_sources = self.scheduler.due_sources()
+            if due_sources:
+                try:
+                    await self.fetch_and_process_all(due_sources)
+                except Exception as e:
+                    self.logger.error(f"Error in auto-fetch loop: {e}", exc_info=True)
+
+                    # Reschedule sources the failed cycle didn't reach
+                    still_due = set(self.scheduler.due_sources())
+                    for source in due_sources:
+                        if source in still_due:
+                            self.scheduler.record(source, 0)
 
-            await asyncio.sleep(settings.update_interval_seconds)
+            await asyncio.sleep(self.scheduler.seconds_until_next())
 
     def stop(self) -> None:
         """Stop the handler."""
-        self.running = False
\ No newline at end of file
+        self.running = False
+        self.dispatcher.stop()
+
+    async def drain(self) -> None:
+        """Write offers still buffered for storage and snapshot the seen-set."""
+        await self.offer_service.drain()
+
+    async def close(self) -> None:
+        """Release resources held by services."""
+        await self.scraper_service.close()
+        await self.offer_service.storage.close()
\ No newline at end of file
@@ -0,0 +1,169 @@
+"""Single pinned status message summarizing fetch cycles."""
+import asyncio
+import json
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Optional
+
+import discord
+
+from src.config.constants import MessageTemplate
+from src.config.settings import settings
+
+# Discord message length limit and width of the error column
+MESSAGE_LIMIT = 2000
+ERROR_WIDTH = 32
+
+
+@dataclass
+class SourceStatus:
+    """Latest fetch results of one source."""
+    name: str
+    checked_at: datetime = None
+    scraped: int = 0
+    new: int = 0
+    total_new: int = 0
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+
+class StatusReporter:
+    """Keeps one pinned message per channel and edits it with a per-source table.
+
+    Edits are debounced to at most one per min_interval_seconds, so Discord
+    traffic stays constant however many sources or cycles there are. The
+    message ID is remembered across restarts; webhook channels skip pinning.
+    """
+
+    def __init__(self, channel: discord.TextChannel, min_interval_seconds: float = 60.0):
+        """Initialize reporter for channel."""
+        self.channel = channel
+        self.min_interval_seconds = min_interval_seconds
+        self.logger = logging.getLogger(__name__)
+        self.sources: Dict[str, SourceStatus] = {}
+        self.queued = 0
+        self._message: Optional[discord.Message] = None
+        self._last_edit = 0.0
+        self._pending: Optional[asyncio.Task] = None
+        self._state_path = settings.data_dir / "status_message.json"
+        self._pins = getattr(channel, "supports_pins", True)
+
+    def record(
+            self,
+            source: str,
+            name: str,
+            scraped: int,
+            new: int,
+            seconds: float,
+            error: Optional[str] = None
+    ) -> None:
+        """Record results of fetching source."""
+        status = self.sources.setdefault(source, SourceStatus(name=name))
+        status.checked_at = datetime.now()
+        status.scraped = scraped
+        status.new = new
+        status.total_new += new
+        status.seconds = seconds
+        status.error = error
+
+    def render(self) -> str:
+        """Render status message."""
+        rows = [(
+            MessageTemplate.STATUS_SOURCE, MessageTemplate.STATUS_CHECKED, MessageTemplate.STATUS_SCRAPED,
+            MessageTemplate.STATUS_NEW, MessageTemplate.STATUS_TOTAL, MessageTemplate.STATUS_LATENCY,
+            MessageTemplate.STATUS_STATE
+        )]
+        for status in self.sources.values():
+            state = MessageTemplate.STATUS_OK
+            if status.error:
+                state = status.error if len(status.error) <= ERROR_WIDTH else status.error[:ERROR_WIDTH - 1] + "…"
+            rows.append((
+                status.name,
+                status.checked_at.strftime("%H:%M") if status.checked_at else "-",
+                str(status.scraped),
+                str(status.new),
+                str(status.total_new),
+                f"{status.seconds:.1f}s",
+                state
+            ))
+
+        widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+        table = "\n".join(
+            " | ".join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip()
+            for row in rows
+        )
+        message = "\n".join((
+            MessageTemplate.STATUS_HEADER.format(time=datetime.now().strftime("%Y-%m-%d %H:%M")),
+            f"```\n{table}\n```",
+            MessageTemplate.STATUS_QUEUE_LINE.format(count=self.queued)
+        ))
+        return message[:MESSAGE_LIMIT]
+
+    async def publish(self) -> None:
+        """Edit status message now, or schedule the edit once the debounce interval passes."""
+        wait = self.min_interval_seconds - (time.monotonic() - self._last_edit)
+        if wait <= 0:
+            await self._edit()
+        elif self._pending is None or self._pending.done():
+            self._pending = asyncio.create_task(self._edit_later(wait))
+
+    async def _edit_later(self, delay: float) -> None:
+        """Edit status message after delay."""
+        await asyncio.sleep(delay)
+        await self._edit()
+
+    async def _edit(self) -> None:
+        """Write current status to the pinned message, creating it on first use."""
+        self._last_edit = time.monotonic()
+        content = self.render()
+        try:
+            if self._message is None:
+                self._message = await self._find_previous()
+            if self._message is None:
+                self._message = await self.channel.send(content)
+                self._remember(self._message.id)
+                if self._pins:
+                    await self._pin(self._message)
+            else:
+                await self._message.edit(content=content)
+        except discord.NotFound:
+            # Status message was deleted; post a new one next time
+            self._message = None
+        except discord.HTTPException as e:
+            self.logger.error(f"Failed to update status message: {e}")
+
+    async def _find_previous(self) -> Optional[discord.Message]:
+        """Find status message posted by a previous run."""
+        try:
+            with open(self._state_path, "r", encoding="utf-8") as f:
+                message_id = json.load(f)["message_id"]
+            return await self.channel.fetch_message(message_id)
+        except (OSError, ValueError, KeyError, discord.NotFound):
+            pass
+        return await self._find_pinned() if self._pins else None
+
+    def _remember(self, message_id: int) -> None:
+        """Persist status message ID for the next run."""
+        try:
+            with open(self._state_path, "w", encoding="utf-8") as f:
+                json.dump({"message_id": message_id}, f)
+        except OSError as e:
+            self.logger.warning(f"Failed to remember status message: {e}")
+
+    async def _find_pinned(self) -> Optional[discord.Message]:
+        """Find status message pinned by a previous run."""
+        header = MessageTemplate.STATUS_HEADER.split("{", 1)[0]
+        me = self.channel.guild.me if self.channel.guild else None
+        for message in await self.channel.pins():
+            if me is not None and message.author.id == me.id and message.content.startswith(header):
+                return message
+        return None
+
+    async def _pin(self, message: discord.Message) -> None:
+        """Pin status message if permitted."""
+        try:
+            await message.pin()
+        except discord.Forbidden:
+            self.logger.warning("Missing permission to pin status message")
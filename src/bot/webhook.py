@@ -0,0 +1,41 @@
+"""Headless delivery through a channel webhook."""
+import logging
+from typing import List, Optional
+
+import discord
+
+from src.utils.http_client import http_client
+
+
+class WebhookChannel:
+    """Posts to a Discord channel through its webhook, without a gateway connection.
+
+    Offers the subset of the TextChannel API the handler uses, on the pooled
+    HTTP session shared with the scrapers.
+    """
+
+    # Webhooks can't pin messages
+    supports_pins = False
+
+    def __init__(self, url: str):
+        """Initialize webhook from its URL."""
+        self.webhook = discord.Webhook.from_url(url, session=http_client.get_session())
+        self.logger = logging.getLogger(__name__)
+
+    async def send(
+            self,
+            content: Optional[str] = None,
+            *,
+            embeds: Optional[List[discord.Embed]] = None
+    ) -> discord.WebhookMessage:
+        """Post message and get it back for later edits."""
+        kwargs = {"wait": True}
+        if content is not None:
+            kwargs["content"] = content
+        if embeds is not None:
+            kwargs["embeds"] = embeds
+        return await self.webhook.send(**kwargs)
+
+    async def fetch_message(self, message_id: int) -> discord.WebhookMessage:
+        """Fetch message posted by this webhook."""
+        return await self.webhook.fetch_message(message_id)
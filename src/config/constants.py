@@ -11,10 +11,8 @@ class LogLevel(str, Enum):
 
 
 class MessageTemplate:
-    CHECKING_SOURCE = "🔍 Sprawdzanie ofert z {source}..."
-    NEW_OFFERS_SENT = "✅ Wysłano {count} nowych ofert z {source}."
     ERROR_FETCHING = "❌ Błąd podczas pobierania ofert z {source}: {error}"
-    DAILY_RESET = "🔄 Reset listy wysłanych ofert (nowy dzień)."
+    SEEN_WINDOW_ROTATED = "🔄 Usunięto z listy wysłanych oferty starsze niż {days} dni."
     BOT_LOGGED_IN = "[BOT] Zalogowano jako {user}"
     BOT_STARTED = "[BOT] Rozpoczynam automatyczne wysyłanie ofert."
 
@@ -25,6 +23,27 @@ class MessageTemplate:
         "🔗 Link: {url}"
     )
     PUBLICATION_TIME_LINE = "⏰ Czas publikacji: {time}\n"
+    STATUS_HEADER = "📊 **Status wyszukiwania** (aktualizacja {time})"
+    STATUS_QUEUE_LINE = "📬 Oferty w kolejce do wysłania: {count}"
+    STATUS_SOURCE = "Źródło"
+    STATUS_CHECKED = "Sprawdzono"
+    STATUS_SCRAPED = "Ofert"
+    STATUS_NEW = "Nowe"
+    STATUS_TOTAL = "Razem"
+    STATUS_LATENCY = "Czas"
+    STATUS_STATE = "Stan"
+    STATUS_OK = "OK"
+
+    EMBED_PRICE_FIELD = "💸 Cena"
+    EMBED_PUBLICATION_TIME_FIELD = "⏰ Czas publikacji"
+    EMBED_LINK_FIELD = "🔗 Link"
+    EMBED_LINK_TEXT = "Otwórz ogłoszenie"
+
+    PRICE_DROP_MESSAGE = (
+        "📉 **{title}**\n"
+        "💸 Cena: {old_price} → {price}\n"
+        "🔗 Link: {url}"
+    )
 
 
 class ScraperName(str, Enum):
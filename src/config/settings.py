@@ -1,8 +1,11 @@
 """Simplified application configuration without Pydantic."""
 import os
 from pathlib import Path
+from typing import Optional
 from dotenv import load_dotenv
 
+from src.models.subscription import SearchQuery
+
 # Load environment variables
 load_dotenv()
 
@@ -13,52 +16,140 @@ class Settings:
     def __init__(self):
         # Discord settings
         self.discord_token = os.getenv("DISCORD_TOKEN")
-        self.discord_channel_id = int(os.getenv("DISCORD_CHANNEL_ID"))
+        self.discord_channel_id = int(os.getenv("DISCORD_CHANNEL_ID", "0"))
+
+        # "gateway" runs a bot client; "webhook" posts headless through DISCORD_WEBHOOK_URL
+        self.discord_transport = os.getenv("DISCORD_TRANSPORT", "gateway")
+        self.discord_webhook_url = os.getenv("DISCORD_WEBHOOK_URL")
 
         # Search settings
         self.search_location = os.getenv("SEARCH_LOCATION", "Siedlce")
         self.search_radius_km = int(os.getenv("SEARCH_RADIUS_KM", "150"))
         self.max_price = int(os.getenv("MAX_PRICE", "13000"))
 
+        # JSON list of subscriptions (search parameters + channel); unset uses the search above
+        self.subscriptions_file = os.getenv("SUBSCRIPTIONS_FILE")
+
         # Bot settings
         self.update_interval_seconds = int(os.getenv("UPDATE_INTERVAL_SECONDS", "900"))
         self.log_level = os.getenv("LOG_LEVEL", "INFO")
 
+        # Days an offer stays in the seen-set before it may be sent again
+        self.seen_window_days = int(os.getenv("SEEN_WINDOW_DAYS", "14"))
+
+        # Cross-marketplace duplicate suppression
+        self.cross_source_dedup = os.getenv("CROSS_SOURCE_DEDUP", "true").lower() == "true"
+        self.duplicate_similarity_threshold = float(os.getenv("DUPLICATE_SIMILARITY_THRESHOLD", "0.6"))
+
+        # Duplicate listing detection by thumbnail perceptual hash (needs Pillow)
+        self.image_dedup = os.getenv("IMAGE_DEDUP", "true").lower() == "true"
+        self.image_hash_max_distance = int(os.getenv("IMAGE_HASH_MAX_DISTANCE", "6"))
+        self.thumbnail_fetch_concurrency = int(os.getenv("THUMBNAIL_FETCH_CONCURRENCY", "4"))
+
+        # Price drop alerts for already sent offers
+        self.price_drop_alerts = os.getenv("PRICE_DROP_ALERTS", "true").lower() == "true"
+        self.price_history_points = int(os.getenv("PRICE_HISTORY_POINTS", "8"))
+
+        # HTTP settings
+        self.http_timeout_seconds = int(os.getenv("HTTP_TIMEOUT_SECONDS", "30"))
+        self.http_max_connections = int(os.getenv("HTTP_MAX_CONNECTIONS", "20"))
+        self.http_max_connections_per_host = int(os.getenv("HTTP_MAX_CONNECTIONS_PER_HOST", "2"))
+        self.http_keepalive_seconds = int(os.getenv("HTTP_KEEPALIVE_SECONDS", "60"))
+        self.http_cache_enabled = os.getenv("HTTP_CACHE_ENABLED", "true").lower() == "true"
+        self.http_cache_max_age_days = int(os.getenv("HTTP_CACHE_MAX_AGE_DAYS", "7"))
+
+        # Pagination settings
+        self.scrape_max_pages = int(os.getenv("SCRAPE_MAX_PAGES", "3"))
+        self.scrape_page_fanout = int(os.getenv("SCRAPE_PAGE_FANOUT", "2"))
+
+        # Streaming settings ("full" downloads whole pages, "stream" parses cards
+        # as they arrive); a limit of 0 reads every card on each page
+        self.scrape_mode = os.getenv("SCRAPE_MODE", "full")
+        self.stream_offer_limit = int(os.getenv("STREAM_OFFER_LIMIT", "0"))
+
+        # Parse stage settings (0 parses in-process on the event loop)
+        self.parse_workers = int(os.getenv("PARSE_WORKERS", "2"))
+
+        # Politeness settings (0 requests per minute disables the limit)
+        self.host_requests_per_minute = int(os.getenv("HOST_REQUESTS_PER_MINUTE", "30"))
+        self.host_request_burst = int(os.getenv("HOST_REQUEST_BURST", "4"))
+
+        # Adaptive polling bounds (update_interval_seconds is the starting interval)
+        self.min_poll_interval_seconds = int(os.getenv("MIN_POLL_INTERVAL_SECONDS", "180"))
+        self.max_poll_interval_seconds = int(os.getenv("MAX_POLL_INTERVAL_SECONDS", "3600"))
+        self.target_new_offers_per_poll = float(os.getenv("TARGET_NEW_OFFERS_PER_POLL", "1.0"))
+
+        # Resilience settings
+        self.circuit_failure_threshold = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "3"))
+        self.circuit_cooldown_seconds = int(os.getenv("CIRCUIT_COOLDOWN_SECONDS", "1800"))
+
+        # Storage backend ("csv" or "sqlite"; sqlite imports existing CSV history)
+        self.storage_backend = os.getenv("STORAGE_BACKEND", "csv")
+
+        # Write buffer: saves are grouped per fetch cycle and written at the latest after
+        # the delay; durability is "flush", "fsync" (every batch) or "interval"
+        self.storage_write_buffer = os.getenv("STORAGE_WRITE_BUFFER", "true").lower() == "true"
+        self.storage_flush_delay_seconds = int(os.getenv("STORAGE_FLUSH_DELAY_SECONDS", "60"))
+        self.storage_durability = os.getenv("STORAGE_DURABILITY", "interval")
+        self.storage_fsync_interval_seconds = int(os.getenv("STORAGE_FSYNC_INTERVAL_SECONDS", "300"))
+
+        # Seen-set snapshot for warm starts (log tail after it is replayed on startup)
+        self.seen_snapshot = os.getenv("SEEN_SNAPSHOT", "true").lower() == "true"
+        self.seen_snapshot_interval_seconds = int(os.getenv("SEEN_SNAPSHOT_INTERVAL_SECONDS", "900"))
+
+        # Discord delivery ("embeds" packs up to 10 offers per message, "text" sends one each)
+        self.delivery_mode = os.getenv("DELIVERY_MODE", "embeds")
+        self.discord_messages_per_second = float(os.getenv("DISCORD_MESSAGES_PER_SECOND", "1.0"))
+        self.discord_message_burst = int(os.getenv("DISCORD_MESSAGE_BURST", "5"))
+        self.discord_retry_max_delay_seconds = int(os.getenv("DISCORD_RETRY_MAX_DELAY_SECONDS", "300"))
+
+        # Pinned status message is edited at most once per interval
+        self.status_min_interval_seconds = int(os.getenv("STATUS_MIN_INTERVAL_SECONDS", "60"))
+
         # Paths
         self.data_dir = Path("data")
         self.data_dir.mkdir(exist_ok=True)
 
-    def get_otomoto_url(self) -> str:
+    @property
+    def default_query(self) -> SearchQuery:
+        """Search configured by the environment."""
+        return SearchQuery(self.search_location, self.search_radius_km, self.max_price)
+
+    def get_otomoto_url(self, query: Optional[SearchQuery] = None) -> str:
         """Generate Otomoto search URL."""
+        query = query or self.default_query
         return (
-            f"https://www.otomoto.pl/osobowe/{self.search_location.lower()}"
-            f"?search%5Bdist%5D={self.search_radius_km}"
-            f"&search%5Bfilter_float_price%3Ato%5D={self.max_price}"
+            f"https://www.otomoto.pl/osobowe/{query.location.lower()}"
+            f"?search%5Bdist%5D={query.radius_km}"
+            f"&search%5Bfilter_float_price%3Ato%5D={query.max_price}"
             "&search%5Border%5D=created_at_first%3Adesc"
         )
 
-    def get_lento_url(self) -> str:
+    def get_lento_url(self, query: Optional[SearchQuery] = None) -> str:
         """Generate Lento search URL."""
+        query = query or self.default_query
         return (
-            f"https://{self.search_location.lower()}.lento.pl/motoryzacja/samochody.html"
-            f"?radius={int(self.search_radius_km / 3)}"
-            f"&price_to={self.max_price}"
+            f"https://{query.location.lower()}.lento.pl/motoryzacja/samochody.html"
+            f"?radius={int(query.radius_km / 3)}"
+            f"&price_to={query.max_price}"
         )
 
-    def get_autoplac_url(self) -> str:
+    def get_autoplac_url(self, query: Optional[SearchQuery] = None) -> str:
         """Generate Autoplac search URL."""
+        query = query or self.default_query
         return (
-            f"https://autoplac.pl/oferty/samochody-osobowe/mazowieckie/{self.search_location.lower()}"
-            f"/cena-do-{int(self.max_price / 1000)}-tysiecy/prywatne"
-            f"?range={self.search_radius_km}"
+            f"https://autoplac.pl/oferty/samochody-osobowe/mazowieckie/{query.location.lower()}"
+            f"/cena-do-{int(query.max_price / 1000)}-tysiecy/prywatne"
+            f"?range={query.radius_km}"
         )
 
-    def get_sprzedajemy_url(self) -> str:
+    def get_sprzedajemy_url(self, query: Optional[SearchQuery] = None) -> str:
         """Generate Sprzedajemy search URL."""
+        query = query or self.default_query
         return (
-            f"https://sprzedajemy.pl/{self.search_location.lower()}/motoryzacja/samochody-osobowe"
-            f"?inp_distance={self.search_radius_km}"
-            f"&inp_price%5Bto%5D={self.max_price}"
+            f"https://sprzedajemy.pl/{query.location.lower()}/motoryzacja/samochody-osobowe"
+            f"?inp_distance={query.radius_km}"
+            f"&inp_price%5Bto%5D={query.max_price}"
             "&offset=0&inp_seller_type_id=1"
         )
 
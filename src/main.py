@@ -7,6 +7,7 @@ from typing import Optional
 
 from src.bot.client import OfferBot
 from src.bot.handlers import OfferHandler
+from src.bot.webhook import WebhookChannel
 from src.config.settings import settings
 from src.utils.logger import setup_logging
 
@@ -19,10 +20,18 @@ class Application:
         self.bot: Optional[OfferBot] = None
         self.handler: Optional[OfferHandler] = None
         self.logger = logging.getLogger(__name__)
+        self._stopped = asyncio.Event()
+        self._main_task: Optional[asyncio.Task] = None
+        self._shutdown_task: Optional[asyncio.Task] = None
 
     async def start(self) -> None:
         """Start the application."""
         self.logger.info("Starting Car Offers Bot...")
+        self._main_task = asyncio.current_task()
+
+        if settings.discord_transport == "webhook":
+            await self.start_headless()
+            return
 
         # Create bot and handler
         self.bot = OfferBot()
@@ -32,23 +41,50 @@ class Application:
         @self.bot.event
         async def on_bot_initialized(channel):
             """Handle bot initialization."""
-            await self.handler.initialize(channel)
+            try:
+                await self.handler.initialize(channel)
+            except ValueError as e:
+                self.logger.error(str(e))
+                await self.bot.close()
 
         # Start bot
         await self.bot.start(settings.discord_token)
 
+    async def start_headless(self) -> None:
+        """Run without a gateway connection, posting through the channel webhook."""
+        if not settings.discord_webhook_url:
+            raise ValueError("DISCORD_WEBHOOK_URL is required for webhook transport")
+
+        self.handler = OfferHandler()
+        await self.handler.initialize(WebhookChannel(settings.discord_webhook_url))
+        await self._stopped.wait()
+
     async def shutdown(self) -> None:
-        """Gracefully shutdown the application."""
+        """Gracefully shutdown the application, once however often it is requested."""
+        # Both the signal handler and main's finally get here
+        if self._shutdown_task is None:
+            self._shutdown_task = asyncio.create_task(self._shutdown())
+        await asyncio.shield(self._shutdown_task)
+
+    async def _shutdown(self) -> None:
+        """Drain and close services, then cancel remaining tasks."""
         self.logger.info("Shutting down...")
+        self._stopped.set()
 
         if self.handler:
             self.handler.stop()
+            # Persist offers marked as sent before anything is torn down
+            await self.handler.drain()
+            await self.handler.close()
 
         if self.bot:
             await self.bot.close()
 
-        # Wait for pending tasks
-        tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        # Wait for pending tasks; the main task returns by itself once the bot stopped
+        tasks = [
+            t for t in asyncio.all_tasks()
+            if t is not asyncio.current_task() and t is not self._main_task
+        ]
         if tasks:
             self.logger.info(f"Cancelling {len(tasks)} pending tasks...")
             for task in tasks:
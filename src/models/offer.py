@@ -1,9 +1,50 @@
 """Offer data models."""
-from dataclasses import dataclass
+import hashlib
+from dataclasses import dataclass, fields
 from datetime import datetime
 from typing import Optional
 
 
+def normalize_source(source) -> str:
+    """Get canonical lowercase source name, e.g. "otomoto"."""
+    value = getattr(source, "value", source) or ""
+    return str(value).rsplit(".", 1)[-1].lower()
+
+
+def make_offer_key(
+        source: Optional[str],
+        listing_id: Optional[str],
+        title: str = "",
+        price: str = ""
+) -> int:
+    """Build compact 64-bit offer key from (source, listing ID).
+
+    Offers without a listing ID fall back to the legacy (title, price) identity.
+    """
+    if source and listing_id:
+        parts = ("id", normalize_source(source), listing_id)
+    else:
+        parts = ("legacy", title, price)
+    digest = hashlib.blake2b("\x1f".join(parts).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+def make_delivery_key(key: int, target: Optional[str]) -> int:
+    """Build 64-bit key of offer's delivery to target (None for the default channel)."""
+    parts = ("to", str(key), target or "")
+    digest = hashlib.blake2b("\x1f".join(parts).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+def history_key(key: int, target: Optional[str]) -> int:
+    """Get seen-set key of history row; rows saved before per-target history lack a target.
+
+    Such rows stand for delivery to every subscription, so they keep the plain offer key.
+    Newer rows store "" for the default channel.
+    """
+    return key if target is None else make_delivery_key(key, target or None)
+
+
 @dataclass(frozen=True)
 class Offer:
     """Car offer model."""
@@ -13,6 +54,11 @@ class Offer:
     publication_time: Optional[str] = None
     source: Optional[str] = None
     scraped_at: datetime = None
+    listing_id: Optional[str] = None
+    mileage: Optional[int] = None
+    year: Optional[int] = None
+    thumbnail_url: Optional[str] = None
+    price_value: Optional[int] = None  # whole PLN parsed from price
 
     def __post_init__(self):
         """Initialize scraped_at if not provided."""
@@ -20,9 +66,19 @@ class Offer:
             object.__setattr__(self, 'scraped_at', datetime.now())
 
     @property
-    def unique_key(self) -> tuple[str, str]:
+    def unique_key(self) -> int:
         """Generate unique key for offer identification."""
-        return (self.title, self.price)
+        return make_offer_key(self.source, self.listing_id, self.title, self.price)
+
+    def to_tuple(self) -> tuple:
+        """Convert offer to compact tuple for passing between processes."""
+        return tuple(getattr(self, f.name) for f in fields(self) if f.name != "scraped_at")
+
+    @classmethod
+    def from_tuple(cls, values: tuple) -> "Offer":
+        """Create offer from tuple produced by to_tuple."""
+        names = [f.name for f in fields(cls) if f.name != "scraped_at"]
+        return cls(**dict(zip(names, values)))
 
     def to_dict(self) -> dict:
         """Convert offer to dictionary."""
@@ -32,5 +88,10 @@ class Offer:
             "url": self.url,
             "publication_time": self.publication_time,
             "source": self.source,
-            "scraped_at": self.scraped_at.isoformat() if self.scraped_at else None
+            "scraped_at": self.scraped_at.isoformat() if self.scraped_at else None,
+            "listing_id": self.listing_id,
+            "mileage": self.mileage,
+            "year": self.year,
+            "thumbnail_url": self.thumbnail_url,
+            "price_value": self.price_value
         }
\ No newline at end of file
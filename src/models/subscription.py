@@ -0,0 +1,41 @@
+"""Search subscription models."""
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from src.models.offer import Offer
+
+
+@dataclass(frozen=True)
+class SearchQuery:
+    """Marketplace search parameters shared by all scrapers."""
+    location: str
+    radius_km: int
+    max_price: int
+
+
+@dataclass(frozen=True)
+class Subscription:
+    """Search whose matching offers are delivered to one channel."""
+    name: str
+    location: str
+    radius_km: int
+    max_price: int
+    channel_id: Optional[int] = None
+    webhook_url: Optional[str] = None
+
+    @property
+    def group_key(self) -> Tuple[str, int]:
+        """Key of subscriptions answerable by one marketplace query."""
+        return self.location.lower(), self.radius_km
+
+    @property
+    def target(self) -> Optional[str]:
+        """Delivery target (webhook URL or channel ID), None for the default channel."""
+        if self.webhook_url:
+            return self.webhook_url
+        return str(self.channel_id) if self.channel_id else None
+
+    def matches(self, offer: Offer) -> bool:
+        """Check if offer fits subscription's price limit; unknown prices always fit."""
+        # Search URLs filter by price too, but promoted listings ignore it
+        return offer.price_value is None or offer.price_value <= self.max_price
@@ -1,6 +1,7 @@
 """Autoplac scraper implementation."""
-from typing import List
-from bs4 import BeautifulSoup
+import re
+from typing import List, Optional
+from bs4 import BeautifulSoup, SoupStrainer
 
 from src.scrapers.base import BaseScraper
 from src.models.offer import Offer
@@ -10,6 +11,12 @@ from src.config.constants import ScraperName
 class AutoplacScraper(BaseScraper):
     """Scraper for Autoplac.pl website."""
 
+    listing_region = SoupStrainer("nwa-offer-card-unified")
+    card_start = b"<nwa-offer-card-unified"
+    card_tag = "nwa-offer-card-unified"
+    fingerprint_pattern = re.compile(rb'href="(/oferta/[^"]+)"')
+    listing_id_pattern = re.compile(r'-(\d+)(?:[/?#]|$)')
+
     def __init__(self):
         """Initialize Autoplac scraper."""
         super().__init__(ScraperName.AUTOPLAC)
@@ -21,7 +28,7 @@ class AutoplacScraper(BaseScraper):
 
         for card in offer_cards:
             try:
-                offer = self._parse_card(card)
+                offer = self.parse_card(card)
                 if offer:
                     offers.append(offer)
             except Exception as e:
@@ -30,7 +37,7 @@ class AutoplacScraper(BaseScraper):
 
         return offers
 
-    def _parse_card(self, card) -> Offer:
+    def parse_card(self, card) -> Optional[Offer]:
         """Parse single card into Offer."""
         title_tag = card.find("p", class_="content__name")
         if not title_tag:
@@ -52,5 +59,6 @@ class AutoplacScraper(BaseScraper):
             title=title,
             url=link,
             price=price,
-            publication_time=None  # Autoplac doesn't show publication time
+            publication_time=None,  # Autoplac doesn't show publication time
+            thumbnail_url=self._extract_thumbnail(card, link)
         )
\ No newline at end of file
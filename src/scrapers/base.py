@@ -1,17 +1,57 @@
 """Base scraper interface."""
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import AsyncIterator, List, Mapping, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode, urljoin
+import asyncio
+import hashlib
 import logging
-import requests
-from bs4 import BeautifulSoup
+import re
+import aiohttp
+from bs4 import BeautifulSoup, SoupStrainer, FeatureNotFound
 
 from src.models.offer import Offer
-from src.utils.decorators import retry_on_failure
+from src.utils.decorators import async_retry_on_failure
+from src.utils.http_client import http_client
+from src.utils.http_cache import http_cache
+from src.utils.rate_limiter import rate_limiter
+from src.utils.text import parse_price
+
+
+# Raw price text ("12 500 zł", "12&nbsp;500 PLN") folded into page fingerprints
+_RAW_PRICE = re.compile(rb"\d(?:[\d .]|\xc2\xa0|&nbsp;)*(?:z\xc5\x82|PLN)")
 
 
 class BaseScraper(ABC):
     """Abstract base class for all scrapers."""
 
+    # Query parameter selecting results page (1-based)
+    page_param: str = "page"
+
+    # Parser backend; scrapers switch to "lxml" one at a time
+    parser_engine: str = "html.parser"
+
+    # Part of the page holding offers; None builds a tree of the whole document
+    listing_region: Optional[SoupStrainer] = None
+
+    # Raw opening of one offer card and its tag, used to split streamed pages
+    card_start: Optional[bytes] = None
+    card_tag: Optional[str] = None
+
+    # Raw marker of listing region; streamed cards before it are ignored
+    stream_region_start: Optional[bytes] = None
+
+    # Pattern pulling offer links or IDs out of raw HTML for change detection
+    fingerprint_pattern: Optional[re.Pattern] = None
+
+    # Raw price of an offer card folded into fingerprints; its first group, if any, is the price
+    price_pattern: re.Pattern = _RAW_PRICE
+
+    # Pattern capturing canonical listing ID from offer URL
+    listing_id_pattern: Optional[re.Pattern] = None
+
+    # Price markers of listings quoted in currencies other than PLN
+    foreign_currency_markers: tuple = ("EUR", "€", "USD", "$")
+
     def __init__(self, name: str):
         """Initialize scraper with name."""
         self.name = name
@@ -24,30 +64,238 @@ class BaseScraper(ABC):
             )
         }
 
-    @retry_on_failure(max_attempts=3, delay=1.0)
-    def fetch_page(self, url: str) -> BeautifulSoup:
-        """Fetch and parse webpage."""
+    @async_retry_on_failure(
+        max_attempts=3,
+        delay=1.0,
+        exceptions=(aiohttp.ClientError, asyncio.TimeoutError),
+        jitter=True
+    )
+    async def fetch_page(self, url: str) -> Optional[Tuple[bytes, Mapping[str, str]]]:
+        """Fetch raw webpage body and response headers, or None when unchanged since last fetch.
+
+        Validators in the headers are only stored once the caller has parsed
+        the body, so a failed parse isn't answered by a 304 next time.
+        """
         self.logger.debug(f"Fetching page: {url}")
-        response = requests.get(url, headers=self.headers, timeout=30)
-        response.raise_for_status()
-        return BeautifulSoup(response.text, "html.parser")
+        await rate_limiter.acquire(url)
+        session = http_client.get_session()
+        headers = {**self.headers, **http_cache.conditional_headers(url)}
+
+        async with session.get(url, headers=headers) as response:
+            if response.status == 304:
+                http_cache.record(self.name, hit=True)
+                self.logger.debug(f"Page not modified: {url}")
+                return None
+
+            response.raise_for_status()
+            body = await response.read()
+
+        http_cache.record(self.name, hit=False)
+        return body, response.headers
+
+    def fingerprint(self, html: bytes) -> Optional[str]:
+        """Hash offer identifiers and prices of the page without parsing it."""
+        if self.fingerprint_pattern is None:
+            return None
+
+        matches = self.fingerprint_pattern.findall(html)
+        if not matches:
+            return None
+        # Prices take part so that price changes of known offers get parsed
+        matches += self._card_prices(html)
+        return hashlib.blake2b(b"\n".join(matches), digest_size=16).hexdigest()
+
+    def _card_prices(self, html: bytes) -> List[bytes]:
+        """Get first raw price of every offer card, leaving out ads and widgets around them."""
+        if self.card_start is None:
+            return []
+
+        region = html.find(self.stream_region_start) if self.stream_region_start else 0
+        starts = []
+        start = html.find(self.card_start, max(region, 0))
+        while start != -1 and region != -1:
+            starts.append(start)
+            start = html.find(self.card_start, start + len(self.card_start))
+        if not starts:
+            return []
+
+        # The last card has no closing marker; bound it by the longest card before it
+        ends = starts[1:]
+        longest = max((end - start for start, end in zip(starts, ends)), default=len(html))
+        ends.append(min(starts[-1] + longest, len(html)))
+
+        group = 1 if self.price_pattern.groups else 0
+        prices = []
+        for start, end in zip(starts, ends):
+            match = self.price_pattern.search(html, start, end)
+            if match:
+                prices.append(match.group(group))
+        return prices
+
+    def make_soup(self, markup: bytes | str) -> BeautifulSoup:
+        """Parse listing region of the page with configured parser engine."""
+        try:
+            return BeautifulSoup(markup, self.parser_engine, parse_only=self.listing_region)
+        except FeatureNotFound:
+            self.logger.warning(f"Parser {self.parser_engine} unavailable, using html.parser")
+            return BeautifulSoup(markup, "html.parser", parse_only=self.listing_region)
+
+    def get_page_url(self, url: str, page: int) -> str:
+        """Build URL of given results page (1-based)."""
+        if page <= 1:
+            return url
+        return self._set_query_param(url, self.page_param, str(page))
+
+    @staticmethod
+    def _set_query_param(url: str, key: str, value: str) -> str:
+        """Set or replace single query parameter in URL."""
+        parts = urlsplit(url)
+        query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k != key]
+        query.append((key, value))
+        return urlunsplit(parts._replace(query=urlencode(query)))
 
     @abstractmethod
     def parse_offers(self, soup: BeautifulSoup) -> List[Offer]:
         """Parse offers from BeautifulSoup object."""
         pass
 
-    def scrape(self, url: str) -> List[Offer]:
-        """Scrape offers from URL."""
+    @abstractmethod
+    def parse_card(self, card) -> Optional[Offer]:
+        """Parse single offer card element."""
+        pass
+
+    async def stream_offers(self, url: str) -> AsyncIterator[Offer]:
+        """Yield offers as their cards arrive.
+
+        The page is split on card_start and every complete card is parsed
+        on its own. Closing the iterator early drops the connection instead
+        of downloading the rest of the page.
+        """
+        self.logger.debug(f"Streaming page: {url}")
+        await rate_limiter.acquire(url)
+        session = http_client.get_session()
+        async with session.get(url, headers=self.headers) as response:
+            response.raise_for_status()
+            encoding = response.charset or "utf-8"
+            buffer = bytearray()
+            in_region = self.stream_region_start is None
+
+            try:
+                async for chunk in response.content.iter_chunked(16384):
+                    buffer.extend(chunk)
+
+                    if not in_region:
+                        region = buffer.find(self.stream_region_start)
+                        if region == -1:
+                            del buffer[:max(len(buffer) - len(self.stream_region_start), 0)]
+                            continue
+                        del buffer[:region]
+                        in_region = True
+
+                    start = buffer.find(self.card_start)
+
+                    while start != -1:
+                        # A card is complete once the next one begins
+                        end = buffer.find(self.card_start, start + len(self.card_start))
+                        if end == -1:
+                            break
+
+                        offer = self._parse_fragment(bytes(buffer[start:end]), encoding)
+                        start = end
+                        if offer:
+                            yield offer
+
+                    # Keep the unfinished card, or a tail that may hold a split marker
+                    keep_from = start if start != -1 else max(len(buffer) - len(self.card_start), 0)
+                    del buffer[:keep_from]
+
+                if buffer.startswith(self.card_start):
+                    offer = self._parse_fragment(bytes(buffer), encoding)
+                    if offer:
+                        yield offer
+            finally:
+                if not response.content.at_eof():
+                    response.close()
+
+    def _parse_fragment(self, fragment: bytes, encoding: str) -> Optional[Offer]:
+        """Parse single streamed card fragment."""
+        try:
+            soup = BeautifulSoup(fragment.decode(encoding, errors="replace"), self.parser_engine)
+        except FeatureNotFound:
+            soup = BeautifulSoup(fragment.decode(encoding, errors="replace"), "html.parser")
+
+        card = soup.find(self.card_tag)
+        if not card:
+            return None
+
         try:
-            soup = self.fetch_page(url)
-            offers = self.parse_offers(soup)
+            offer = self.parse_card(card)
+        except Exception as e:
+            self.logger.warning(f"Error parsing card: {e}")
+            return None
+
+        if offer:
+            self._tag_offer(offer)
+        return offer
+
+    def parse_page(self, html: bytes) -> List[Offer]:
+        """Parse offers from raw webpage body."""
+        offers = self.parse_offers(self.make_soup(html))
+        return self._finish_offers(offers)
+
+    @classmethod
+    def extract_listing_id(cls, url: str) -> Optional[str]:
+        """Extract canonical listing ID from offer URL."""
+        if cls.listing_id_pattern is None or not url:
+            return None
+        match = cls.listing_id_pattern.search(url)
+        return match.group(1) if match else None
+
+    @staticmethod
+    def _extract_thumbnail(card, base_url: str) -> Optional[str]:
+        """Get absolute URL of first image in offer card."""
+        img = card.find("img")
+        if not img:
+            return None
+
+        # Lazy-loaded images keep the real URL in data-src
+        src = img.get("data-src") or img.get("src")
+        if not src or src.startswith("data:"):
+            return None
+        return urljoin(base_url, src)
 
-            # Add source to offers
-            for offer in offers:
-                object.__setattr__(offer, 'source', self.name)
+    def normalize_price(self, price: str) -> Optional[int]:
+        """Parse displayed price into whole PLN, None when missing or in foreign currency."""
+        if not price or any(marker in price for marker in self.foreign_currency_markers):
+            return None
+        return parse_price(price)
+
+    def _tag_offer(self, offer: Offer) -> None:
+        """Set source, listing ID and numeric price of parsed offer."""
+        object.__setattr__(offer, 'source', self.name)
+        if offer.listing_id is None:
+            object.__setattr__(offer, 'listing_id', self.extract_listing_id(offer.url))
+        if offer.price_value is None:
+            object.__setattr__(offer, 'price_value', self.normalize_price(offer.price))
+
+    def _finish_offers(self, offers: List[Offer]) -> List[Offer]:
+        """Tag parsed offers with their source, listing ID and numeric price."""
+        for offer in offers:
+            self._tag_offer(offer)
+
+        self.logger.info(f"Scraped {len(offers)} offers")
+        return offers
+
+    async def scrape(self, url: str) -> List[Offer]:
+        """Scrape offers from URL."""
+        try:
+            page = await self.fetch_page(url)
+            if page is None:
+                return []
 
-            self.logger.info(f"Scraped {len(offers)} offers")
+            html, headers = page
+            offers = self.parse_page(html)
+            http_cache.store(url, headers)
             return offers
 
         except Exception as e:
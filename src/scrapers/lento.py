@@ -1,6 +1,7 @@
 """Lento scraper implementation."""
-from typing import List
-from bs4 import BeautifulSoup
+import re
+from typing import List, Optional
+from bs4 import BeautifulSoup, SoupStrainer
 
 from src.scrapers.base import BaseScraper
 from src.models.offer import Offer
@@ -10,6 +11,13 @@ from src.config.constants import ScraperName
 class LentoScraper(BaseScraper):
     """Scraper for Lento.pl website."""
 
+    # Parse-time class values aren't split yet, so match promoted cards with extra classes too
+    listing_region = SoupStrainer("div", class_=re.compile(r"(?:^|\s)tablelist-tr(?:\s|$)"))
+    card_start = b'<div class="tablelist-tr'
+    card_tag = "div"
+    fingerprint_pattern = re.compile(rb'href="([^"]+,\d+\.html)"')
+    listing_id_pattern = re.compile(r',(\d+)\.html')
+
     def __init__(self):
         """Initialize Lento scraper."""
         super().__init__(ScraperName.LENTO)
@@ -21,7 +29,7 @@ class LentoScraper(BaseScraper):
 
         for offer_div in offer_divs:
             try:
-                offer = self._parse_offer_div(offer_div)
+                offer = self.parse_card(offer_div)
                 if offer:
                     offers.append(offer)
             except Exception as e:
@@ -30,7 +38,7 @@ class LentoScraper(BaseScraper):
 
         return offers
 
-    def _parse_offer_div(self, offer_div) -> Offer:
+    def parse_card(self, offer_div) -> Optional[Offer]:
         """Parse single offer div into Offer."""
         title_tag = offer_div.find("a", class_="title-list-item")
         if not title_tag:
@@ -51,5 +59,6 @@ class LentoScraper(BaseScraper):
             title=title,
             url=link,
             price=price,
-            publication_time=publication_time
+            publication_time=publication_time,
+            thumbnail_url=self._extract_thumbnail(offer_div, link)
         )
\ No newline at end of file
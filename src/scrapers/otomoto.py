@@ -1,19 +1,150 @@
 """Otomoto scraper implementation."""
-from typing import List
-from bs4 import BeautifulSoup
+import re
+from datetime import datetime
+from typing import List, Optional
+from bs4 import BeautifulSoup, SoupStrainer
 
 from src.scrapers.base import BaseScraper
 from src.models.offer import Offer
 from src.config.constants import ScraperName, ErrorMessage
+from src.utils import fast_json
+
+NEXT_DATA_MARKER = b'id="__NEXT_DATA__"'
+SCRIPT_END = b"</script>"
 
 
 class OtomotoScraper(BaseScraper):
     """Scraper for Otomoto.pl website."""
 
+    parser_engine = "lxml"
+    listing_region = SoupStrainer("div", attrs={"data-testid": "search-results"})
+    card_start = b"<article"
+    card_tag = "article"
+    stream_region_start = b'data-testid="search-results"'
+    fingerprint_pattern = re.compile(rb'otomoto\.pl/osobowe/oferta/[^"\s?#\\]+')
+    # Amount and currency sit in separate elements
+    price_pattern = re.compile(rb'data-sentry-element="Price"[^>]*>([^<]+)<')
+    listing_id_pattern = re.compile(r'-ID(\w+)\.html')
+
+    # Read offers from embedded Next.js state, walking the DOM only without it
+    use_embedded_data = True
+
     def __init__(self):
         """Initialize Otomoto scraper."""
         super().__init__(ScraperName.OTOMOTO)
 
+    def parse_page(self, html: bytes) -> List[Offer]:
+        """Parse offers from embedded listing data, falling back to the DOM."""
+        if self.use_embedded_data:
+            offers = self._parse_embedded_data(html)
+            if offers is not None:
+                return self._finish_offers(offers)
+            self.logger.debug("Embedded listing data not found, parsing DOM")
+
+        return super().parse_page(html)
+
+    def _parse_embedded_data(self, html: bytes) -> Optional[List[Offer]]:
+        """Parse offers from __NEXT_DATA__ script, or None when it is missing."""
+        marker = html.find(NEXT_DATA_MARKER)
+        if marker == -1:
+            return None
+
+        start = html.find(b">", marker) + 1
+        end = html.find(SCRIPT_END, start)
+        if start == 0 or end == -1:
+            return None
+
+        try:
+            next_data = fast_json.loads(html[start:end])
+            edges = self._find_advert_edges(next_data)
+        except (ValueError, TypeError, AttributeError) as e:
+            self.logger.warning(f"Invalid embedded listing data: {e}")
+            return None
+
+        if edges is None:
+            return None
+
+        offers = []
+        for edge in edges:
+            try:
+                offer = self._parse_node(edge.get("node") or {})
+                if offer:
+                    offers.append(offer)
+            except Exception as e:
+                self.logger.warning(f"Error parsing listing node: {e}")
+                continue
+
+        return offers
+
+    def _find_advert_edges(self, next_data: dict) -> Optional[list]:
+        """Locate search result edges inside the urql cache of the page."""
+        urql_state = next_data.get("props", {}).get("pageProps", {}).get("urqlState", {})
+
+        for entry in urql_state.values():
+            data = entry.get("data")
+            # Cache entries hold JSON strings; skip decoding unrelated ones
+            if isinstance(data, str):
+                if '"advertSearch"' not in data:
+                    continue
+                data = fast_json.loads(data)
+
+            if isinstance(data, dict) and "advertSearch" in data:
+                return data["advertSearch"].get("edges", [])
+
+        return None
+
+    def _parse_node(self, node: dict) -> Optional[Offer]:
+        """Parse single listing node into Offer."""
+        title = (node.get("title") or "").strip()
+        link = node.get("url")
+        if not title or not link:
+            return None
+
+        # Format price the same way as the DOM parser ("12 500 PLN")
+        amount = (node.get("price") or {}).get("amount") or {}
+        units = amount.get("units")
+        currency = amount.get("currencyCode", "PLN")
+        if units is not None:
+            price = f"{int(units):,}".replace(",", " ") + f" {currency}"
+        else:
+            price = "Brak ceny"
+
+        parameters = {
+            parameter.get("key"): parameter.get("value")
+            for parameter in node.get("parameters") or []
+        }
+
+        return Offer(
+            title=title,
+            url=link,
+            price=price,
+            publication_time=self._format_created_at(node.get("createdAt")),
+            # Prefer the URL slug ID so keys match offers parsed from the DOM
+            listing_id=self.extract_listing_id(link) or (str(node["id"]) if node.get("id") else None),
+            mileage=self._to_int(parameters.get("mileage")),
+            year=self._to_int(parameters.get("year")),
+            thumbnail_url=(node.get("thumbnail") or {}).get("x1"),
+            price_value=int(units) if units is not None and currency == "PLN" else None
+        )
+
+    @staticmethod
+    def _format_created_at(created_at: Optional[str]) -> str:
+        """Format ISO creation timestamp for display."""
+        if not created_at:
+            return "Brak informacji o czasie"
+        try:
+            return datetime.fromisoformat(created_at.replace("Z", "+00:00")).strftime("%Y-%m-%d %H:%M")
+        except ValueError:
+            return created_at
+
+    @staticmethod
+    def _to_int(value) -> Optional[int]:
+        """Convert numeric parameter value to int."""
+        try:
+            return int(str(value).replace(" ", ""))
+        except (TypeError, ValueError):
+            return None
+
     def parse_offers(self, soup: BeautifulSoup) -> List[Offer]:
         """Parse offers from Otomoto search results."""
         search_results = soup.find("div", {"data-testid": "search-results"})
@@ -21,11 +152,11 @@ class OtomotoScraper(BaseScraper):
             raise ValueError(ErrorMessage.NO_SEARCH_RESULTS)
 
         offers = []
-        articles = search_results.find_all("article")[:20]  # Limit to 20 offers
+        articles = search_results.find_all("article")
 
         for article in articles:
             try:
-                offer = self._parse_article(article)
+                offer = self.parse_card(article)
                 if offer:
                     offers.append(offer)
             except Exception as e:
@@ -34,7 +165,7 @@ class OtomotoScraper(BaseScraper):
 
         return offers
 
-    def _parse_article(self, article) -> Offer:
+    def parse_card(self, article) -> Optional[Offer]:
         """Parse single article into Offer."""
         # Extract title and link
         title_tag = article.find("h2")
@@ -60,7 +191,8 @@ class OtomotoScraper(BaseScraper):
             title=title,
             url=link,
             price=price,
-            publication_time=publication_time
+            publication_time=publication_time,
+            thumbnail_url=self._extract_thumbnail(article, link)
         )
 
     def _extract_publication_time(self, article) -> str:
@@ -0,0 +1,33 @@
+"""Scraper registry and process-pool parse entry point."""
+from typing import Dict, List, Optional, Type
+
+from src.scrapers.base import BaseScraper
+from src.scrapers.otomoto import OtomotoScraper
+from src.scrapers.lento import LentoScraper
+from src.scrapers.autoplac import AutoplacScraper
+from src.scrapers.sprzedajemy import SprzedajemyScraper
+
+
+SCRAPERS: Dict[str, Type[BaseScraper]] = {
+    "otomoto": OtomotoScraper,
+    "lento": LentoScraper,
+    "autoplac": AutoplacScraper,
+    "sprzedajemy": SprzedajemyScraper
+}
+
+# Scraper instances living in the current worker process
+_worker_scrapers: Dict[str, BaseScraper] = {}
+
+
+def parse_offer_rows(source: str, html: bytes) -> List[tuple]:
+    """Parse page in a worker process and return compact offer tuples."""
+    scraper = _worker_scrapers.get(source)
+    if scraper is None:
+        scraper = _worker_scrapers[source] = SCRAPERS[source]()
+    return [offer.to_tuple() for offer in scraper.parse_page(html)]
+
+
+def extract_listing_id(source: str, url: str) -> Optional[str]:
+    """Extract listing ID from offer URL using the source's scraper rules."""
+    scraper_class = SCRAPERS.get(source)
+    return scraper_class.extract_listing_id(url) if scraper_class else None
@@ -1,6 +1,7 @@
 """Sprzedajemy scraper implementation."""
-from typing import List
-from bs4 import BeautifulSoup
+import re
+from typing import List, Optional
+from bs4 import BeautifulSoup, SoupStrainer
 
 from src.scrapers.base import BaseScraper
 from src.models.offer import Offer
@@ -10,10 +11,23 @@ from src.config.constants import ScraperName
 class SprzedajemyScraper(BaseScraper):
     """Scraper for Sprzedajemy.pl website."""
 
+    # Sprzedajemy pages by item offset instead of page number
+    page_size: int = 30
+
+    listing_region = SoupStrainer("ul", class_="list normal")
+    card_start = b'<li id="offer-'
+    card_tag = "li"
+    fingerprint_pattern = re.compile(rb'id="(offer-\d+)"')
+    listing_id_pattern = re.compile(r'nr(\d+)(?:[/?#]|$)')
+
     def __init__(self):
         """Initialize Sprzedajemy scraper."""
         super().__init__(ScraperName.SPRZEDAJEMY)
 
+    def get_page_url(self, url: str, page: int) -> str:
+        """Build URL of given results page (1-based)."""
+        return self._set_query_param(url, "offset", str((max(page, 1) - 1) * self.page_size))
+
     def parse_offers(self, soup: BeautifulSoup) -> List[Offer]:
         """Parse offers from Sprzedajemy search results."""
         offers = []
@@ -27,7 +41,7 @@ class SprzedajemyScraper(BaseScraper):
                 continue
 
             try:
-                offer = self._parse_list_item(li)
+                offer = self.parse_card(li)
                 if offer:
                     offers.append(offer)
             except Exception as e:
@@ -36,7 +50,7 @@ class SprzedajemyScraper(BaseScraper):
 
         return offers
 
-    def _parse_list_item(self, li) -> Offer:
+    def parse_card(self, li) -> Optional[Offer]:
         """Parse single list item into Offer."""
         title_tag = li.find("h2", class_="title")
         if not title_tag:
@@ -58,11 +72,16 @@ class SprzedajemyScraper(BaseScraper):
         # Extract publication time
         publication_time = self._extract_publication_time(li)
 
+        # Fall back to the list item's data ID when the URL has no "nr" suffix
+        listing_id = self.extract_listing_id(link) or li.get("id", "").removeprefix("offer-") or None
+
         return Offer(
             title=title,
             url=link,
             price=price,
-            publication_time=publication_time
+            publication_time=publication_time,
+            listing_id=listing_id,
+            thumbnail_url=self._extract_thumbnail(li, link)
         )
 
     def _extract_price(self, li) -> str:
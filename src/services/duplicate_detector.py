@@ -0,0 +1,187 @@
+"""Cross-marketplace duplicate detection with MinHash-LSH."""
+import hashlib
+import logging
+import random
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+from src.models.offer import Offer, normalize_source
+from src.utils.text import title_shingles, parse_price
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+class MinHashLSH:
+    """Locality-sensitive index answering Jaccard similarity queries sublinearly."""
+
+    def __init__(self, num_perm: int = 64, bands: int = 16, seed: int = 1):
+        """Initialize index with num_perm hash functions split into bands."""
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+
+        rng = random.Random(seed)
+        self._permutations = [
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+        self._tables: List[Dict[Tuple[int, ...], Set[int]]] = [{} for _ in range(bands)]
+        self._signatures: Dict[int, Tuple[int, ...]] = {}
+
+    @staticmethod
+    def _hash_shingle(shingle: str) -> int:
+        """Stable 32-bit hash of shingle, independent of PYTHONHASHSEED."""
+        return int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=4).digest(), "big")
+
+    def signature(self, shingles: FrozenSet[str]) -> Tuple[int, ...]:
+        """Compute MinHash signature of shingle set."""
+        if not shingles:
+            return tuple([_MAX_HASH] * self.num_perm)
+
+        hashes = [self._hash_shingle(shingle) for shingle in shingles]
+        return tuple(
+            min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+            for a, b in self._permutations
+        )
+
+    def _bands_of(self, signature: Tuple[int, ...]):
+        """Yield (band index, band slice) pairs of signature."""
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows]
+
+    def insert(self, entry_id: int, signature: Tuple[int, ...]) -> None:
+        """Add entry to index."""
+        self.remove(entry_id)
+        self._signatures[entry_id] = signature
+        for band, band_slice in self._bands_of(signature):
+            self._tables[band].setdefault(band_slice, set()).add(entry_id)
+
+    def remove(self, entry_id: int) -> None:
+        """Remove entry from index if present."""
+        signature = self._signatures.pop(entry_id, None)
+        if signature is None:
+            return
+
+        for band, band_slice in self._bands_of(signature):
+            bucket = self._tables[band].get(band_slice)
+            if bucket:
+                bucket.discard(entry_id)
+                if not bucket:
+                    del self._tables[band][band_slice]
+
+    def query(self, signature: Tuple[int, ...]) -> Set[int]:
+        """Get entries sharing at least one band with signature."""
+        candidates: Set[int] = set()
+        for band, band_slice in self._bands_of(signature):
+            candidates |= self._tables[band].get(band_slice, set())
+        return candidates
+
+    def __len__(self) -> int:
+        """Number of indexed entries."""
+        return len(self._signatures)
+
+
+@dataclass(frozen=True)
+class IndexedOffer:
+    """Recently sent offer kept in the duplicate index."""
+    key: int
+    source: str
+    title: str
+    url: str
+    price: Optional[int]
+    shingles: FrozenSet[str]
+    day: date
+
+
+class DuplicateDetector:
+    """Finds near-identical offers already sent from another marketplace."""
+
+    def __init__(
+            self,
+            window_days: int,
+            similarity_threshold: float = 0.6,
+            price_tolerance: float = 0.05
+    ):
+        """Initialize detector covering given number of days."""
+        self.window_days = window_days
+        self.similarity_threshold = similarity_threshold
+        self.price_tolerance = price_tolerance
+        self.logger = logging.getLogger(__name__)
+        self._index = MinHashLSH()
+        self._entries: Dict[int, IndexedOffer] = {}
+        self._days: Dict[date, Set[int]] = {}
+
+    def __len__(self) -> int:
+        """Number of indexed offers."""
+        return len(self._entries)
+
+    def add(self, offer: Offer, day: date = None) -> None:
+        """Index sent offer."""
+        shingles = title_shingles(offer.title)
+        if not shingles:
+            return
+
+        entry = IndexedOffer(
+            key=offer.unique_key,
+            source=normalize_source(offer.source),
+            title=offer.title,
+            url=offer.url,
+            price=parse_price(offer.price),
+            shingles=shingles,
+            day=day or date.today()
+        )
+        self._forget(entry.key)
+        self._entries[entry.key] = entry
+        self._days.setdefault(entry.day, set()).add(entry.key)
+        self._index.insert(entry.key, self._index.signature(shingles))
+
+    def find_duplicate(self, offer: Offer) -> Optional[IndexedOffer]:
+        """Get indexed offer from another source that looks like the same car."""
+        shingles = title_shingles(offer.title)
+        if not shingles:
+            return None
+
+        source = normalize_source(offer.source)
+        price = parse_price(offer.price)
+        best, best_similarity = None, self.similarity_threshold
+
+        for key in self._index.query(self._index.signature(shingles)):
+            entry = self._entries[key]
+            if entry.source == source or not self._prices_match(price, entry.price):
+                continue
+
+            # LSH gives candidates; confirm with exact Jaccard similarity
+            similarity = len(shingles & entry.shingles) / len(shingles | entry.shingles)
+            if similarity >= best_similarity:
+                best, best_similarity = entry, similarity
+
+        return best
+
+    def _prices_match(self, price: Optional[int], other: Optional[int]) -> bool:
+        """Check if prices are equal within tolerance; unknown prices never match."""
+        if price is None or other is None:
+            return False
+        return abs(price - other) <= self.price_tolerance * max(price, other)
+
+    def _forget(self, key: int) -> None:
+        """Remove offer from index."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._index.remove(key)
+        day_keys = self._days.get(entry.day)
+        if day_keys:
+            day_keys.discard(key)
+
+    def evict_expired(self) -> None:
+        """Drop offers indexed before the window."""
+        first_day = date.today() - timedelta(days=self.window_days - 1)
+        for day in [day for day in self._days if day < first_day]:
+            for key in list(self._days[day]):
+                self._forget(key)
+            del self._days[day]
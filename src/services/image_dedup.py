@@ -0,0 +1,308 @@
+"""Duplicate listing detection by perceptual hashes of thumbnails."""
+import asyncio
+import hashlib
+import io
+import json
+import logging
+import time
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+import aiofiles
+import aiohttp
+
+from src.models.offer import Offer
+from src.config.settings import settings
+from src.utils.http_client import http_client
+from src.utils.rate_limiter import rate_limiter
+
+try:
+    from PIL import Image
+except ImportError:  # pragma: no cover - Pillow is optional
+    Image = None
+
+# Thumbnail URL fragments of marketplaces' stock "no photo" images
+PLACEHOLDER_MARKERS = ("placeholder", "no-photo", "no_photo", "nophoto", "brak-zdjecia", "brak_zdjecia")
+
+# Distinct offers after which a thumbnail counts as shared rather than a listing's own photo
+SHARED_AFTER = 2
+
+
+def is_placeholder(url: str) -> bool:
+    """Check if thumbnail URL is an inline or stock placeholder image."""
+    lowered = url.lower()
+    return lowered.startswith("data:") or any(marker in lowered for marker in PLACEHOLDER_MARKERS)
+
+
+def dhash(image_bytes: bytes, hash_size: int = 8) -> int:
+    """Compute 64-bit difference hash of image."""
+    with Image.open(io.BytesIO(image_bytes)) as image:
+        small = image.convert("L").resize((hash_size + 1, hash_size), Image.LANCZOS)
+        pixels = list(small.tobytes())
+
+    value = 0
+    for row in range(hash_size):
+        for col in range(hash_size):
+            left = pixels[row * (hash_size + 1) + col]
+            right = pixels[row * (hash_size + 1) + col + 1]
+            value = (value << 1) | (left > right)
+    return value
+
+
+class BKTree:
+    """Burkhard-Keller tree for nearest-hash lookups under Hamming distance."""
+
+    def __init__(self):
+        """Initialize empty tree."""
+        # Node: [hash, item, {distance: child node}]
+        self._root: Optional[list] = None
+        self._size = 0
+
+    def __len__(self) -> int:
+        """Number of stored hashes."""
+        return self._size
+
+    @staticmethod
+    def distance(a: int, b: int) -> int:
+        """Hamming distance of two hashes."""
+        return (a ^ b).bit_count()
+
+    def add(self, value: int, item) -> None:
+        """Store item under hash value."""
+        self._size += 1
+        if self._root is None:
+            self._root = [value, item, {}]
+            return
+
+        node = self._root
+        while True:
+            d = self.distance(value, node[0])
+            child = node[2].get(d)
+            if child is None:
+                node[2][d] = [value, item, {}]
+                return
+            node = child
+
+    def search(self, value: int, max_distance: int) -> List[Tuple[int, object]]:
+        """Get (distance, item) pairs within max_distance of value."""
+        if self._root is None:
+            return []
+
+        results = []
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            d = self.distance(value, node[0])
+            if d <= max_distance:
+                results.append((d, node[1]))
+            # Triangle inequality bounds which subtrees can hold matches
+            for child_distance, child in node[2].items():
+                if d - max_distance <= child_distance <= d + max_distance:
+                    stack.append(child)
+        return sorted(results, key=lambda result: result[0])
+
+
+class ThumbnailCache:
+    """On-disk cache of thumbnails and their hashes, keyed by URL."""
+
+    def __init__(self, dirname: str = "thumbnails"):
+        """Initialize cache directory and hash index."""
+        self.directory = settings.data_dir / dirname
+        self.directory.mkdir(exist_ok=True)
+        self.index_path = self.directory / "index.json"
+        self.logger = logging.getLogger(__name__)
+        self._entries: Dict[str, dict] = {}
+        self._dirty = False
+        self._load()
+
+    def _load(self) -> None:
+        """Load hash index persisted by previous runs."""
+        if not self.index_path.exists():
+            return
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                self._entries = json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable thumbnail index: {e}")
+
+    def _image_path(self, url: str):
+        """Path of cached thumbnail file."""
+        return self.directory / hashlib.sha1(url.encode("utf-8")).hexdigest()
+
+    def get_hash(self, url: str) -> Optional[int]:
+        """Get cached hash of thumbnail."""
+        entry = self._entries.get(url)
+        return entry["hash"] if entry else None
+
+    async def put(self, url: str, image_bytes: bytes, value: int) -> None:
+        """Cache thumbnail and its hash."""
+        async with aiofiles.open(self._image_path(url), mode="wb") as f:
+            await f.write(image_bytes)
+        self._entries[url] = {"hash": value, "stored_at": time.time()}
+        self._dirty = True
+
+    def linked_keys(self, url: str) -> List[int]:
+        """Get distinct offer keys that used thumbnail or were matched against it."""
+        entry = self._entries.get(url)
+        return entry.get("keys", []) if entry else []
+
+    def link(self, url: str, key: int) -> None:
+        """Remember that offer used thumbnail, up to the shared threshold."""
+        entry = self._entries.get(url)
+        if entry is None:
+            return
+        keys = entry.setdefault("keys", [])
+        if key not in keys and len(keys) < SHARED_AFTER:
+            keys.append(key)
+            self._dirty = True
+
+    def is_shared(self, url: str) -> bool:
+        """Check if thumbnail is linked to several distinct offers."""
+        return len(self.linked_keys(url)) >= SHARED_AFTER
+
+    def mark_sent(self, url: str, key: int, day: date) -> None:
+        """Remember that thumbnail belongs to a sent offer."""
+        entry = self._entries.get(url)
+        if entry is not None:
+            entry["sent_key"] = key
+            entry["sent_on"] = day.isoformat()
+            self._dirty = True
+
+    def sent_entries(self, since: date) -> List[Tuple[str, int, int, date]]:
+        """Get (url, hash, offer key, day) of thumbnails of offers sent since date."""
+        since_str = since.isoformat()
+        return [
+            (url, entry["hash"], entry["sent_key"], date.fromisoformat(entry["sent_on"]))
+            for url, entry in self._entries.items()
+            if entry.get("sent_on", "") >= since_str
+        ]
+
+    def save(self, max_age_days: int) -> None:
+        """Evict entries older than max age and persist index."""
+        cutoff = time.time() - max_age_days * 86400
+        for url in [url for url, entry in self._entries.items() if entry["stored_at"] < cutoff]:
+            del self._entries[url]
+            self._image_path(url).unlink(missing_ok=True)
+            self._dirty = True
+
+        if not self._dirty:
+            return
+
+        tmp_path = self.index_path.with_suffix(".tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f)
+            tmp_path.replace(self.index_path)
+            self._dirty = False
+        except OSError as e:
+            self.logger.error(f"Failed to save thumbnail index: {e}")
+
+
+class ImageDuplicateDetector:
+    """Finds reposts of recently sent offers that reuse the same photos."""
+
+    def __init__(self, window_days: int, max_distance: int = 6, concurrency: int = 4):
+        """Initialize detector."""
+        self.window_days = window_days
+        self.max_distance = max_distance
+        self.logger = logging.getLogger(__name__)
+        self.enabled = Image is not None
+        if not self.enabled:
+            self.logger.warning("Pillow not installed, image duplicate detection disabled")
+            return
+
+        self.cache = ThumbnailCache()
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._tree = BKTree()
+        self._rebuild()
+
+    @property
+    def first_day(self) -> date:
+        """Oldest day still covered by the window."""
+        return date.today() - timedelta(days=self.window_days - 1)
+
+    def _rebuild(self) -> None:
+        """Rebuild tree from thumbnails of offers sent within the window."""
+        self._tree = BKTree()
+        for url, value, key, _ in self.cache.sent_entries(self.first_day):
+            self._tree.add(value, (key, url))
+
+    async def _fetch_hash(self, url: str) -> Optional[int]:
+        """Get thumbnail hash, downloading the image only on cache miss."""
+        cached = self.cache.get_hash(url)
+        if cached is not None:
+            return cached
+
+        async with self._semaphore:
+            try:
+                await rate_limiter.acquire(url)
+                session = http_client.get_session()
+                async with session.get(url) as response:
+                    response.raise_for_status()
+                    image_bytes = await response.read()
+                value = await asyncio.to_thread(dhash, image_bytes)
+            except (aiohttp.ClientError, asyncio.TimeoutError, OSError) as e:
+                self.logger.debug(f"Failed to hash thumbnail {url}: {e}")
+                return None
+
+        await self.cache.put(url, image_bytes, value)
+        return value
+
+    async def split_duplicates(
+            self,
+            offers: List[Offer],
+            suppress: Optional[Callable[[Offer, int], bool]] = None
+    ) -> Tuple[List[Offer], List[Offer]]:
+        """Split offers into unique ones and reposts of sent offers with matching photos.
+
+        suppress(offer, original offer key) decides whether a repost is dropped,
+        by default always; reposts it lets through count as unique. Placeholder
+        thumbnails, and ones shared by several distinct offers, are never taken
+        as evidence of a repost.
+        """
+        if not self.enabled:
+            return offers, []
+
+        urls = [
+            offer.thumbnail_url if offer.thumbnail_url and not is_placeholder(offer.thumbnail_url) else None
+            for offer in offers
+        ]
+        hashes = await asyncio.gather(*(
+            self._fetch_hash(url) if url else asyncio.sleep(0)
+            for url in urls
+        ))
+
+        unique, duplicates = [], []
+        for offer, url, value in zip(offers, urls, hashes):
+            key = offer.unique_key
+            if value is not None and any(linked != key for linked in self.cache.linked_keys(url)):
+                # Same image URL on another listing: a marketplace default, not this car's photo
+                self.cache.link(url, key)
+                value = None
+
+            matches = [] if value is None else [
+                (distance, item) for distance, item in self._tree.search(value, self.max_distance)
+                if item[0] != key and not self.cache.is_shared(item[1])
+            ]
+            if matches:
+                matched_key, matched_url = matches[0][1]
+                self.cache.link(matched_url, key)
+                if suppress is None or suppress(offer, matched_key):
+                    self.logger.info(f"Suppressing {offer.url}: photo matches {matched_url}")
+                    duplicates.append(offer)
+                    continue
+
+            unique.append(offer)
+            if value is not None:
+                self.cache.link(url, key)
+                # Index immediately so reposts within one cycle are caught too
+                self._tree.add(value, (offer.unique_key, offer.thumbnail_url))
+                self.cache.mark_sent(offer.thumbnail_url, offer.unique_key, date.today())
+
+        self.cache.save(self.window_days)
+        return unique, duplicates
+
+    def evict_expired(self) -> None:
+        """Drop hashes of offers sent before the window."""
+        if self.enabled:
+            self._rebuild()
@@ -1,57 +1,293 @@
 """Offer management service."""
+import asyncio
 import logging
-from typing import List, Set
+import time
+from dataclasses import replace
+from typing import Dict, List, Optional, Set, Tuple
 from datetime import date
 
-from src.models.offer import Offer
+from src.models.offer import Offer, make_delivery_key, make_offer_key, normalize_source
+from src.scrapers.registry import extract_listing_id
+from src.services.seen_set import SeenSet
+from src.services.seen_snapshot import SeenSnapshot
+from src.services.duplicate_detector import DuplicateDetector
+from src.services.image_dedup import ImageDuplicateDetector
+from src.services.outbox import Outbox
+from src.services.price_tracker import PriceTracker
 from src.storage.base import BaseStorage
+from src.config.settings import settings
 
 
 class OfferService:
-    """Service for managing offers."""
+    """Service for managing offers.
+
+    Offers are tracked per delivery target: one sent to some subscriptions
+    is still new to the others, and duplicates are suppressed only for
+    targets that got the original.
+    """
 
     def __init__(self, storage: BaseStorage):
         """Initialize offer service."""
         self.storage = storage
         self.logger = logging.getLogger(__name__)
-        self._sent_offers_cache: Set[tuple[str, str]] = set()
+        self._sent_offers_cache = SeenSet(settings.seen_window_days)
         self._cache_date: date = None
+        self.snapshot = SeenSnapshot() if settings.seen_snapshot else None
+        # Offers queued for delivery count as seen until they are marked as sent
+        self.outbox = Outbox()
+        self._last_snapshot = time.monotonic()
+        self.duplicate_detector = DuplicateDetector(
+            window_days=settings.seen_window_days,
+            similarity_threshold=settings.duplicate_similarity_threshold
+        )
+        self._index_task: Optional[asyncio.Task] = None
+        self.image_detector: ImageDuplicateDetector = None
+        if settings.image_dedup:
+            self.image_detector = ImageDuplicateDetector(
+                window_days=settings.seen_window_days,
+                max_distance=settings.image_hash_max_distance,
+                concurrency=settings.thumbnail_fetch_concurrency
+            )
+        self.price_tracker: Optional[PriceTracker] = None
+        if settings.price_drop_alerts:
+            self.price_tracker = PriceTracker(
+                window_days=settings.seen_window_days,
+                max_points=settings.price_history_points
+            )
 
     async def initialize(self) -> None:
         """Initialize service and load existing offers."""
+        await self.storage.migrate_keys(self._key_for_row)
         await self.refresh_cache()
+        await self.storage.initialize()
+
+    @staticmethod
+    def _key_for_row(row: dict) -> int:
+        """Compute offer key of history row stored before keys existed."""
+        source = normalize_source(row.get("source"))
+        listing_id = extract_listing_id(source, row.get("url") or "")
+        return make_offer_key(source, listing_id, row.get("title") or "", row.get("price") or "")
 
     async def refresh_cache(self) -> None:
-        """Refresh sent offers cache."""
+        """Load sent offers of the retention window, then expire whole days."""
         today = date.today()
-        if self._cache_date != today:
-            self._sent_offers_cache = await self.storage.load_offers(today)
-            self._cache_date = today
-            self.logger.info(f"Loaded {len(self._sent_offers_cache)} existing offers")
+        if self._cache_date == today:
+            return
+
+        if self._cache_date is None:
+            first_day = self._sent_offers_cache.first_day
+            await self._load_sent_offers(first_day)
+
+            if settings.cross_source_dedup:
+                # Indexing parses the whole window of history; don't hold up startup for it
+                self._index_task = asyncio.create_task(self._index_recent_offers(first_day))
+        else:
+            self.duplicate_detector.evict_expired()
+            if self.image_detector:
+                self.image_detector.evict_expired()
+            if self.price_tracker:
+                self.price_tracker.evict_expired()
+            expired = self._sent_offers_cache.evict_expired()
+            self.logger.info(
+                f"Expired {expired} days of sent offers, {len(self._sent_offers_cache)} remain"
+            )
+
+        self._cache_date = today
+
+    async def _index_recent_offers(self, first_day: date) -> None:
+        """Rebuild duplicate index from offers sent within the window."""
+        for offer in await self.storage.load_recent_offers(first_day):
+            if not offer.listing_id:
+                # CSV history keeps no listing IDs; recover them so keys match the seen-set
+                offer = replace(offer, listing_id=extract_listing_id(offer.source, offer.url))
+            self.duplicate_detector.add(offer, offer.scraped_at.date())
+        self.logger.info(f"Indexed {len(self.duplicate_detector)} offers for duplicate detection")
+
+    async def _load_sent_offers(self, first_day: date) -> None:
+        """Load seen-set from snapshot, then replay offers logged after it."""
+        position = None
+        snapshot = self.snapshot.load() if self.snapshot else None
+        if snapshot:
+            buckets, position = snapshot
+            for day, keys in buckets.items():
+                if day >= first_day:
+                    self._sent_offers_cache.add_many(keys, day)
+
+        history, _ = await self.storage.load_history_tail(first_day, position)
+        for day, keys in history.items():
+            self._sent_offers_cache.add_many(keys, day)
+
+        replayed = sum(len(keys) for keys in history.values())
+        self.logger.info(
+            f"Loaded {len(self._sent_offers_cache)} existing offers "
+            f"({'snapshot + ' if snapshot else ''}{replayed} replayed from log)"
+        )
+
+    async def checkpoint(self, force: bool = False) -> None:
+        """Flush buffered saves and periodically snapshot the seen-set."""
+        await self.storage.flush()
+        if not self.snapshot:
+            return
+        if not force and time.monotonic() - self._last_snapshot < settings.seen_snapshot_interval_seconds:
+            return
+
+        # Everything up to this position is in the seen-set: offers are cached before saving
+        position = await self.storage.log_position()
+        if position is not None:
+            self.snapshot.save(self._sent_offers_cache, position)
+        self._last_snapshot = time.monotonic()
+
+    async def drain(self) -> None:
+        """Persist buffered saves durably and snapshot the seen-set."""
+        await self.storage.sync()
+        await self.checkpoint(force=True)
+
+    def _is_sent(self, key: int, target: Optional[str]) -> bool:
+        """Check if offer with key was sent to target (history from before targets counts for all)."""
+        return key in self._sent_offers_cache or make_delivery_key(key, target) in self._sent_offers_cache
+
+    def _is_seen(self, key: int, target: Optional[str]) -> bool:
+        """Check if offer with key was sent to target or waits for delivery there."""
+        return self._is_sent(key, target) or (key, target) in self.outbox
+
+    def was_sent(self, offer: Offer, target: Optional[str] = None) -> bool:
+        """Check if offer was already sent to target."""
+        return self._is_sent(offer.unique_key, target)
 
-    def filter_new_offers(self, offers: List[Offer]) -> List[Offer]:
-        """Filter out already sent offers."""
+    def is_seen(self, offer: Offer, target: Optional[str] = None) -> bool:
+        """Check if offer was already sent to target or waits for delivery there."""
+        return self._is_seen(offer.unique_key, target)
+
+    def filter_new_offers(self, offers: List[Offer], targets: Dict[int, Set[Optional[str]]]) -> List[Offer]:
+        """Narrow offers' targets in place to ones they weren't sent or queued to.
+
+        Offers left without targets are filtered out.
+        """
         new_offers = []
+        batch_keys = set()
         for offer in offers:
-            if offer.unique_key not in self._sent_offers_cache:
+            key = offer.unique_key
+            # Offers may repeat across pages when listings shift between fetches
+            if key in batch_keys:
+                continue
+            batch_keys.add(key)
+            targets[key] = {target for target in targets[key] if not self._is_seen(key, target)}
+            if targets[key]:
                 new_offers.append(offer)
         return new_offers
 
-    async def mark_as_sent(self, offers: List[Offer]) -> None:
-        """Mark offers as sent."""
+    def find_price_drops(self, offers: List[Offer]) -> List[Tuple[Offer, int]]:
+        """Get (offer, previous price) pairs of delivered offers that became cheaper."""
+        if not self.price_tracker:
+            return []
+
+        drops = []
+        for offer in offers:
+            # Only delivered offers are tracked; they start tracking in mark_as_sent
+            if offer.unique_key not in self.price_tracker:
+                continue
+            previous = self.price_tracker.observe(offer)
+            if previous is not None:
+                drops.append((offer, previous))
+
+        self.price_tracker.save()
+        return drops
+
+    def _take_recipients(
+            self,
+            offer: Offer,
+            original_key: int,
+            targets: Dict[int, Set[Optional[str]]]
+    ) -> List[Tuple[Offer, Optional[str]]]:
+        """Remove targets that got the original from offer's targets, as (offer, target) pairs."""
+        key = offer.unique_key
+        received = {target for target in targets[key] if self._is_seen(original_key, target)}
+        targets[key] -= received
+        return [(offer, target) for target in received]
+
+    async def split_cross_source_duplicates(
+            self,
+            offers: List[Offer],
+            targets: Dict[int, Set[Optional[str]]]
+    ) -> Tuple[List[Offer], List[Tuple[Offer, Optional[str]]]]:
+        """Split new offers into ones still due somewhere and near-duplicates of offers from other sources.
+
+        A near-duplicate is suppressed, as an (offer, target) pair, only for
+        targets that got the original; targets are narrowed in place.
+        """
+        if not settings.cross_source_dedup:
+            return offers, []
+
+        if self._index_task is not None:
+            # First cycle after startup waits for the index rebuilt in the background
+            try:
+                await self._index_task
+            except Exception as e:
+                self.logger.error(f"Failed to index recent offers: {e}", exc_info=True)
+            self._index_task = None
+
+        unique, duplicates = [], []
+        for offer in offers:
+            match = self.duplicate_detector.find_duplicate(offer)
+            if match:
+                suppressed = self._take_recipients(offer, match.key, targets)
+                if suppressed:
+                    self.logger.info(
+                        f"Suppressing {offer.url} for {len(suppressed)} targets as duplicate of {match.url}"
+                    )
+                duplicates += suppressed
+            if targets[offer.unique_key]:
+                unique.append(offer)
+                # Index immediately so duplicates within one cycle are caught too
+                self.duplicate_detector.add(offer)
+        return unique, duplicates
+
+    async def split_image_duplicates(
+            self,
+            offers: List[Offer],
+            targets: Dict[int, Set[Optional[str]]]
+    ) -> Tuple[List[Offer], List[Tuple[Offer, Optional[str]]]]:
+        """Split new offers into ones still due somewhere and reposts reusing photos of sent offers.
+
+        Like near-duplicates, reposts are suppressed only for targets that got the original.
+        """
+        if not self.image_detector or not offers:
+            return offers, []
+
+        reposts = []
+
+        def suppress(offer: Offer, original_key: int) -> bool:
+            reposts.extend(self._take_recipients(offer, original_key, targets))
+            return not targets[offer.unique_key]
+
+        unique, _ = await self.image_detector.split_duplicates(offers, suppress)
+        return unique, reposts
+
+    async def mark_as_sent(
+            self,
+            offers: List[Offer],
+            target: Optional[str] = None,
+            delivered: bool = True
+    ) -> None:
+        """Mark offers as sent to target; only delivered ones get their prices tracked."""
         if not offers:
             return
 
         # Update cache
-        for offer in offers:
-            self._sent_offers_cache.add(offer.unique_key)
+        self._sent_offers_cache.add_many(make_delivery_key(offer.unique_key, target) for offer in offers)
+        if self.price_tracker and delivered:
+            for offer in offers:
+                self.price_tracker.observe(offer)
+            self.price_tracker.save()
 
         # Persist to storage
-        await self.storage.save_offers(offers)
+        await self.storage.save_offers(offers, target)
 
         self.logger.info(f"Marked {len(offers)} offers as sent")
 
-    async def cleanup_old_data(self, days_to_keep: int = 7) -> None:
-        """Clean up old offer data."""
+    async def cleanup_old_data(self, days_to_keep: int = None) -> None:
+        """Clean up offer data older than the seen-set window (or given days)."""
+        if days_to_keep is None:
+            days_to_keep = settings.seen_window_days
         await self.storage.cleanup_old_offers(days_to_keep)
         self.logger.info(f"Cleaned up offers older than {days_to_keep} days")
\ No newline at end of file
@@ -0,0 +1,185 @@
+"""Durable queue of messages waiting for delivery to Discord."""
+import asyncio
+import json
+import logging
+import os
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from src.models.offer import Offer
+from src.config.settings import settings
+
+# Entry kinds
+KIND_OFFER = "offer"
+KIND_PRICE_DROP = "price_drop"
+
+
+@dataclass
+class OutboxEntry:
+    """Message waiting in the outbox."""
+    kind: str
+    offer: Offer
+    old_price: Optional[int] = None
+    # Channel ID or webhook URL; None delivers to the default channel
+    target: Optional[str] = None
+    # Assigned when queued
+    id: int = 0
+
+
+class Outbox:
+    """Append-only JSONL journal of queued and delivered messages.
+
+    Queued entries are appended before the scrape cycle moves on; delivered
+    ones are acknowledged by ID. Replaying the journal on startup restores
+    everything not yet delivered. Journal writes run in a thread, one at a time.
+    """
+
+    def __init__(self, filename: str = "outbox.jsonl", compact_after: int = 500):
+        """Initialize outbox and restore undelivered entries."""
+        self.path = settings.data_dir / filename
+        self.compact_after = compact_after
+        self.logger = logging.getLogger(__name__)
+        self._pending: Dict[int, OutboxEntry] = {}
+        # (offer key, target) -> number of pending offer entries
+        self._pending_keys: Dict[Tuple[int, Optional[str]], int] = {}
+        self._next_id = 1
+        self._acked_since_compaction = 0
+        self._available = asyncio.Event()
+        self._lock = asyncio.Lock()
+        self._load()
+
+    def __len__(self) -> int:
+        """Number of undelivered entries."""
+        return len(self._pending)
+
+    def __contains__(self, delivery: Tuple[int, Optional[str]]) -> bool:
+        """Check if offer with key waits for delivery to target, given (key, target)."""
+        return delivery in self._pending_keys
+
+    def _load(self) -> None:
+        """Replay journal written by previous runs."""
+        if not self.path.exists():
+            return
+
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # Torn last line of a crashed write
+                    continue
+                if record["op"] == "put":
+                    self._add(OutboxEntry(
+                        id=record["id"],
+                        kind=record["kind"],
+                        offer=Offer.from_tuple(record["offer"]),
+                        old_price=record.get("old_price"),
+                        target=record.get("target")
+                    ))
+                elif record["op"] == "ack":
+                    self._remove(record["id"])
+                self._next_id = max(self._next_id, record["id"] + 1)
+
+        if self._pending:
+            self.logger.info(f"Restored {len(self._pending)} undelivered messages")
+        self._rewrite([self._put_record(entry) for entry in self._pending.values()])
+
+    def _add(self, entry: OutboxEntry) -> None:
+        """Track pending entry."""
+        self._pending[entry.id] = entry
+        if entry.kind == KIND_OFFER:
+            key = (entry.offer.unique_key, entry.target)
+            self._pending_keys[key] = self._pending_keys.get(key, 0) + 1
+        self._available.set()
+
+    def _remove(self, entry_id: int) -> None:
+        """Forget delivered entry."""
+        entry = self._pending.pop(entry_id, None)
+        if entry is None or entry.kind != KIND_OFFER:
+            return
+        key = (entry.offer.unique_key, entry.target)
+        remaining = self._pending_keys[key] - 1
+        if remaining:
+            self._pending_keys[key] = remaining
+        else:
+            del self._pending_keys[key]
+
+    def _append(self, records: List[dict]) -> None:
+        """Append records to journal and force them to disk."""
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records))
+            f.flush()
+            os.fsync(f.fileno())
+
+    @staticmethod
+    def _put_record(entry: OutboxEntry) -> dict:
+        """Journal record queueing entry."""
+        record = {"op": "put", "id": entry.id, "kind": entry.kind, "offer": entry.offer.to_tuple()}
+        if entry.old_price is not None:
+            record["old_price"] = entry.old_price
+        if entry.target is not None:
+            record["target"] = entry.target
+        return record
+
+    async def put_offers(self, offers: List[Offer], target: Optional[str] = None) -> None:
+        """Queue offers for delivery to target."""
+        await self.put([OutboxEntry(kind=KIND_OFFER, offer=offer, target=target) for offer in offers])
+
+    async def put_price_drop(self, offer: Offer, old_price: int, target: Optional[str] = None) -> None:
+        """Queue price drop notice for delivery to target."""
+        await self.put([OutboxEntry(kind=KIND_PRICE_DROP, offer=offer, old_price=old_price, target=target)])
+
+    async def put(self, entries: List[OutboxEntry]) -> None:
+        """Assign IDs, journal entries in one write and track them."""
+        if not entries:
+            return
+
+        async with self._lock:
+            records = []
+            for entry in entries:
+                entry.id = self._next_id
+                self._next_id += 1
+                records.append(self._put_record(entry))
+
+            await asyncio.to_thread(self._append, records)
+            for entry in entries:
+                self._add(entry)
+
+    def peek(self, limit: int) -> List[OutboxEntry]:
+        """Get up to limit oldest entries of the same kind and target, in queue order."""
+        batch = []
+        for entry in self._pending.values():
+            if len(batch) == limit:
+                break
+            if batch and (entry.kind != batch[0].kind or entry.target != batch[0].target):
+                break
+            batch.append(entry)
+        if not batch:
+            self._available.clear()
+        return batch
+
+    async def ack(self, entries: List[OutboxEntry]) -> None:
+        """Mark entries as delivered, compacting the journal now and then."""
+        async with self._lock:
+            await asyncio.to_thread(self._append, [{"op": "ack", "id": entry.id} for entry in entries])
+            for entry in entries:
+                self._remove(entry.id)
+
+            self._acked_since_compaction += len(entries)
+            if not self._pending or self._acked_since_compaction >= self.compact_after:
+                records = [self._put_record(entry) for entry in self._pending.values()]
+                await asyncio.to_thread(self._rewrite, records)
+
+    async def wait(self) -> None:
+        """Wait until entries are queued."""
+        await self._available.wait()
+
+    def _rewrite(self, records: List[dict]) -> None:
+        """Replace journal with given records (pending entries only)."""
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write("".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self._acked_since_compaction = 0
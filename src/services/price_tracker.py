@@ -0,0 +1,123 @@
+"""Price history of sent offers and price drop detection."""
+import logging
+import struct
+import sys
+from array import array
+from datetime import date, timedelta
+from typing import Dict, Optional
+
+from src.models.offer import Offer
+from src.config.settings import settings
+
+# Record: offer key, day ordinal of last sighting, number of price points
+_HEADER = struct.Struct(">QIB")
+
+
+class PriceTracker:
+    """Keeps the last few prices of sent offers, keyed by offer key."""
+
+    def __init__(self, window_days: int, max_points: int = 8, filename: str = "price_history.bin"):
+        """Initialize tracker and load history persisted by previous runs."""
+        self.window_days = window_days
+        self.max_points = max(2, min(max_points, 255))
+        self.path = settings.data_dir / filename
+        self.logger = logging.getLogger(__name__)
+        self._prices: Dict[int, array] = {}
+        self._last_seen: Dict[int, int] = {}
+        self._dirty = False
+        self._load()
+
+    def __len__(self) -> int:
+        """Number of tracked offers."""
+        return len(self._prices)
+
+    def __contains__(self, key: int) -> bool:
+        """Check if offer key is tracked."""
+        return key in self._prices
+
+    def history(self, key: int) -> list:
+        """Get recorded prices of offer, oldest first."""
+        return list(self._prices.get(key, ()))
+
+    def observe(self, offer: Offer) -> Optional[int]:
+        """Record current price of offer; get previous price if it dropped."""
+        price = offer.price_value
+        if price is None:
+            return None
+
+        key = offer.unique_key
+        today = date.today().toordinal()
+        if self._last_seen.get(key) != today:
+            self._last_seen[key] = today
+            self._dirty = True
+
+        prices = self._prices.get(key)
+        if prices is None:
+            self._prices[key] = array("I", [price])
+            self._dirty = True
+            return None
+
+        previous = prices[-1]
+        if price == previous:
+            return None
+
+        prices.append(price)
+        if len(prices) > self.max_points:
+            # Keep the first price so the total drop stays visible
+            del prices[1]
+        self._dirty = True
+        return previous if price < previous else None
+
+    def evict_expired(self) -> int:
+        """Forget offers not seen within the window; get number forgotten."""
+        first_day = (date.today() - timedelta(days=self.window_days - 1)).toordinal()
+        expired = [key for key, day in self._last_seen.items() if day < first_day]
+        for key in expired:
+            del self._prices[key]
+            del self._last_seen[key]
+        if expired:
+            self._dirty = True
+        return len(expired)
+
+    def _load(self) -> None:
+        """Load history file written by save."""
+        if not self.path.exists():
+            return
+        try:
+            data = self.path.read_bytes()
+            offset = 0
+            while offset < len(data):
+                key, day, count = _HEADER.unpack_from(data, offset)
+                offset += _HEADER.size
+                prices = array("I")
+                prices.frombytes(data[offset:offset + 4 * count])
+                if sys.byteorder == "little":
+                    prices.byteswap()
+                offset += 4 * count
+                self._prices[key] = prices
+                self._last_seen[key] = day
+        except (OSError, struct.error, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable price history: {e}")
+            self._prices.clear()
+            self._last_seen.clear()
+
+    def save(self) -> None:
+        """Persist history if it changed."""
+        if not self._dirty:
+            return
+
+        chunks = []
+        for key, prices in self._prices.items():
+            chunks.append(_HEADER.pack(key, self._last_seen[key], len(prices)))
+            big_endian = array("I", prices)
+            if sys.byteorder == "little":
+                big_endian.byteswap()
+            chunks.append(big_endian.tobytes())
+
+        tmp_path = self.path.with_suffix(".tmp")
+        try:
+            tmp_path.write_bytes(b"".join(chunks))
+            tmp_path.replace(self.path)
+            self._dirty = False
+        except OSError as e:
+            self.logger.error(f"Failed to save price history: {e}")
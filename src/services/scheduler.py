@@ -0,0 +1,68 @@
+"""Adaptive per-source polling scheduler."""
+import logging
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+from src.config.settings import settings
+
+
+@dataclass
+class SourceSchedule:
+    """Polling state of single source."""
+    interval: float
+    next_due: float
+    last_polled: Optional[float] = None
+    arrival_rate: Optional[float] = None  # new offers per second (EWMA)
+
+
+class AdaptiveScheduler:
+    """Gives each source its own polling interval learned from new offer arrivals."""
+
+    def __init__(self, sources: Iterable[str], smoothing: float = 0.3):
+        """Initialize scheduler with every source due immediately."""
+        self.logger = logging.getLogger(__name__)
+        self.smoothing = smoothing
+        now = time.monotonic()
+        self._schedules: Dict[str, SourceSchedule] = {
+            source: SourceSchedule(interval=self._clamp(settings.update_interval_seconds), next_due=now)
+            for source in sources
+        }
+
+    @staticmethod
+    def _clamp(interval: float) -> float:
+        """Keep interval within configured bounds."""
+        return max(settings.min_poll_interval_seconds, min(settings.max_poll_interval_seconds, interval))
+
+    def due_sources(self) -> List[str]:
+        """Get sources whose next poll is due."""
+        now = time.monotonic()
+        return [source for source, schedule in self._schedules.items() if schedule.next_due <= now]
+
+    def seconds_until_next(self) -> float:
+        """Get time until the earliest source is due."""
+        now = time.monotonic()
+        return max(0.0, min(schedule.next_due for schedule in self._schedules.values()) - now)
+
+    def record(self, source: str, new_offers: int) -> None:
+        """Record poll result and schedule next poll of source."""
+        schedule = self._schedules[source]
+        now = time.monotonic()
+
+        if schedule.last_polled is not None:
+            observed = new_offers / max(now - schedule.last_polled, 1.0)
+            if schedule.arrival_rate is None:
+                schedule.arrival_rate = observed
+            else:
+                schedule.arrival_rate += self.smoothing * (observed - schedule.arrival_rate)
+
+            if schedule.arrival_rate > 0:
+                # Poll often enough to collect about target_new_offers_per_poll each time
+                schedule.interval = self._clamp(settings.target_new_offers_per_poll / schedule.arrival_rate)
+            else:
+                # Nothing arrives: back off gradually towards the maximum interval
+                schedule.interval = self._clamp(schedule.interval * 1.5)
+
+        schedule.last_polled = now
+        schedule.next_due = now + schedule.interval
+        self.logger.debug(f"Next poll of {source} in {schedule.interval:.0f}s")
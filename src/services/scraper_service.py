@@ -1,16 +1,27 @@
 """Scraper orchestration service."""
 import asyncio
 import logging
-from typing import Dict, List
-from concurrent.futures import ThreadPoolExecutor
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Mapping, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import aclosing
 
 from src.scrapers.base import BaseScraper
-from src.scrapers.otomoto import OtomotoScraper
-from src.scrapers.lento import LentoScraper
-from src.scrapers.autoplac import AutoplacScraper
-from src.scrapers.sprzedajemy import SprzedajemyScraper
+from src.scrapers.registry import SCRAPERS, parse_offer_rows
 from src.models.offer import Offer
+from src.models.subscription import SearchQuery
 from src.config.settings import settings
+from src.utils.http_client import http_client
+from src.utils.http_cache import http_cache
+from src.utils.circuit_breaker import CircuitBreaker
+
+
+@dataclass
+class ScrapeStats:
+    """Outcome of the latest scrape of one source."""
+    seconds: float = 0.0
+    error: Optional[str] = None
 
 
 class ScraperService:
@@ -20,65 +31,268 @@ class ScraperService:
         """Initialize scraper service."""
         self.logger = logging.getLogger(__name__)
         self.scrapers: Dict[str, BaseScraper] = {
-            "otomoto": OtomotoScraper(),
-            "lento": LentoScraper(),
-            "autoplac": AutoplacScraper(),
-            "sprzedajemy": SprzedajemyScraper()
+            source: scraper_class() for source, scraper_class in SCRAPERS.items()
+        }
+        self.breakers: Dict[str, CircuitBreaker] = {
+            source: CircuitBreaker(
+                source,
+                failure_threshold=settings.circuit_failure_threshold,
+                cooldown_seconds=settings.circuit_cooldown_seconds
+            )
+            for source in self.scrapers
         }
-        self.executor = ThreadPoolExecutor(max_workers=4)
 
-    def get_scraper_urls(self) -> Dict[str, str]:
-        """Get URLs for all scrapers."""
+        # Latency and error of the latest cycle, per source
+        self.stats: Dict[str, ScrapeStats] = {}
+
+        # Listing fingerprints seen in the previous cycle, per page URL
+        self._fingerprints: Dict[str, str] = {}
+
+        # Fingerprints and validators of parsed pages, kept per source until their offers are queued
+        self._pending_pages: Dict[str, Dict[str, Tuple[Optional[str], Mapping[str, str]]]] = {}
+
+        # Parse stage runs outside the event loop's process unless disabled
+        self.parse_executor: Optional[ProcessPoolExecutor] = None
+        if settings.parse_workers > 0:
+            self.parse_executor = ProcessPoolExecutor(max_workers=settings.parse_workers)
+
+    def get_scraper_urls(self, query: Optional[SearchQuery] = None) -> Dict[str, str]:
+        """Get URLs for all scrapers (default: search configured by the environment)."""
         return {
-            "otomoto": settings.get_otomoto_url(),
-            "lento": settings.get_lento_url(),
-            "autoplac": settings.get_autoplac_url(),
-            "sprzedajemy": settings.get_sprzedajemy_url()
+            "otomoto": settings.get_otomoto_url(query),
+            "lento": settings.get_lento_url(query),
+            "autoplac": settings.get_autoplac_url(query),
+            "sprzedajemy": settings.get_sprzedajemy_url(query)
         }
 
-    async def scrape_source(self, source: str, url: str) -> List[Offer]:
+    async def scrape_source(
+            self,
+            source: str,
+            url: str,
+            is_seen: Optional[Callable[[Offer], bool]] = None
+    ) -> List[Offer]:
         """Scrape offers from single source."""
         if source not in self.scrapers:
             raise ValueError(f"Unknown scraper: {source}")
 
         scraper = self.scrapers[source]
-        loop = asyncio.get_event_loop()
+        breaker = self.breakers[source]
+
+        self.stats.setdefault(source, ScrapeStats())
+        if not breaker.allow_request():
+            self.logger.info(f"Skipping {source}: circuit open")
+            self.stats[source].error = "circuit open"
+            return []
+
+        if settings.scrape_mode == "stream" and scraper.card_start:
+            return await self._stream_source(source, url, is_seen)
 
         try:
-            # Run synchronous scraper in thread pool
-            offers = await loop.run_in_executor(
-                self.executor,
-                scraper.scrape,
-                url
-            )
-            return offers
+            offers = await self.scrape_page(source, url)
         except Exception as e:
+            breaker.record_failure()
             self.logger.error(f"Error scraping {source}: {e}")
+            self.stats[source].error = str(e) or type(e).__name__
             return []
 
-    async def scrape_all(self) -> Dict[str, List[Offer]]:
-        """Scrape offers from all sources concurrently."""
-        urls = self.get_scraper_urls()
-        tasks = []
+        breaker.record_success()
+
+        if is_seen is not None and offers and not any(is_seen(o) for o in offers):
+            offers.extend(await self._scrape_next_pages(source, url, is_seen))
+
+        return offers
+
+    async def scrape_page(self, source: str, url: str) -> List[Offer]:
+        """Fetch single page on the event loop and hand it to the parse stage."""
+        scraper = self.scrapers[source]
+        page = await scraper.fetch_page(url)
+        if page is None:
+            # 304 Not Modified: nothing new since the previous cycle
+            return []
+
+        html, headers = page
+        fingerprint = scraper.fingerprint(html)
+        if fingerprint is not None and self._fingerprints.get(url) == fingerprint:
+            self.logger.debug(f"Listing unchanged, skipping parse: {url}")
+            http_cache.store(url, headers)
+            return []
+
+        offers = await self.parse_page(source, html)
+        # Only a page whose offers were processed may be skipped next time
+        self._pending_pages.setdefault(source, {})[url] = (fingerprint, headers)
+        return offers
+
+    def commit_pages(self, source: str) -> None:
+        """Remember fingerprints and validators of source's pages once its offers are queued."""
+        for url, (fingerprint, headers) in self._pending_pages.pop(source, {}).items():
+            http_cache.store(url, headers)
+            if fingerprint is not None:
+                self._fingerprints[url] = fingerprint
+        http_cache.save()
+
+    def discard_pages(self, source: str) -> None:
+        """Forget source's pages whose offers failed to process, so they are parsed again."""
+        self._pending_pages.pop(source, None)
 
-        for source, url in urls.items():
-            task = self.scrape_source(source, url)
-            tasks.append(task)
+    async def parse_page(self, source: str, html: bytes) -> List[Offer]:
+        """Parse raw page in the process pool, or in-process when disabled."""
+        if self.parse_executor is None:
+            return self.scrapers[source].parse_page(html)
 
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        loop = asyncio.get_running_loop()
+        rows = await loop.run_in_executor(self.parse_executor, parse_offer_rows, source, html)
+        return [Offer.from_tuple(row) for row in rows]
 
-        # Map results back to sources
+    async def _scrape_next_pages(
+            self,
+            source: str,
+            url: str,
+            is_seen: Callable[[Offer], bool]
+    ) -> List[Offer]:
+        """Scrape pages after the first until one contains an already seen offer."""
+        scraper = self.scrapers[source]
+        offers = []
+        fanout = max(settings.scrape_page_fanout, 1)
+        page = 2
+
+        while page <= settings.scrape_max_pages:
+            batch = range(page, min(page + fanout, settings.scrape_max_pages + 1))
+            results = await asyncio.gather(
+                *(self.scrape_page(source, scraper.get_page_url(url, p)) for p in batch),
+                return_exceptions=True
+            )
+
+            # Pages are sorted newest-first, so stop at the first page that
+            # fails, is empty, or reaches offers we already know
+            for page_number, result in zip(batch, results):
+                if isinstance(result, Exception):
+                    self.logger.warning(f"Stopping {scraper.name} at page {page_number}: {result}")
+                    return offers
+                if not result:
+                    return offers
+
+                offers.extend(result)
+                if any(is_seen(o) for o in result):
+                    return offers
+
+            page += fanout
+
+        return offers
+
+    async def _stream_source(
+            self,
+            source: str,
+            url: str,
+            is_seen: Optional[Callable[[Offer], bool]] = None
+    ) -> List[Offer]:
+        """Stream pages one by one until offer limit or an already seen offer."""
+        scraper = self.scrapers[source]
+        breaker = self.breakers[source]
+        limit = settings.stream_offer_limit
+        max_pages = settings.scrape_max_pages if is_seen is not None else 1
+        offers: List[Offer] = []
+        done = False
+
+        for page in range(1, max_pages + 1):
+            count_before = len(offers)
+            try:
+                async with aclosing(scraper.stream_offers(scraper.get_page_url(url, page))) as stream:
+                    async for offer in stream:
+                        offers.append(offer)
+                        done = (limit > 0 and len(offers) >= limit) or (
+                            is_seen is not None and is_seen(offer)
+                        )
+                        if done:
+                            break
+            except Exception as e:
+                if page == 1:
+                    breaker.record_failure()
+                    self.logger.error(f"Error scraping {source}: {e}")
+                    self.stats[source].error = str(e) or type(e).__name__
+                    return []
+                self.logger.warning(f"Stopping {source} at page {page}: {e}")
+                break
+
+            if page == 1:
+                breaker.record_success()
+            if done or len(offers) == count_before:
+                break
+
+        self.logger.info(f"Streamed {len(offers)} offers from {source}")
+        return offers
+
+    async def scrape_queries(
+            self,
+            queries: List[SearchQuery],
+            is_seen: Optional[Callable[[Offer], bool]] = None,
+            sources: Optional[List[str]] = None
+    ) -> Dict[str, Dict[SearchQuery, List[Offer]]]:
+        """Scrape offers of queries from all (or given) sources, fetching each distinct URL once.
+
+        Sources run concurrently; URLs of one source are fetched in turn. When
+        is_seen is given, later pages are fetched until one of them contains
+        an offer that was already seen.
+        """
+        urls: Dict[str, Dict[str, List[SearchQuery]]] = {}
+        for query in queries:
+            for source, url in self.get_scraper_urls(query).items():
+                if sources is None or source in sources:
+                    urls.setdefault(source, {}).setdefault(url, []).append(query)
+
+        results = await asyncio.gather(
+            *(self._scrape_urls(source, list(source_urls), is_seen) for source, source_urls in urls.items()),
+            return_exceptions=True
+        )
+
+        # Map results back to sources and queries
         all_offers = {}
-        for (source, _), result in zip(urls.items(), results):
+        for (source, source_urls), result in zip(urls.items(), results):
             if isinstance(result, Exception):
                 self.logger.error(f"Failed to scrape {source}: {result}")
-                all_offers[source] = []
-            else:
-                all_offers[source] = result
+                self.stats.setdefault(source, ScrapeStats()).error = str(result) or type(result).__name__
+                result = {}
+            all_offers[source] = {
+                query: result.get(url, [])
+                for url, url_queries in source_urls.items()
+                for query in url_queries
+            }
+
+        http_cache.save()
+        hit_rates = http_cache.hit_rates()
+        if hit_rates:
+            self.logger.info(
+                "HTTP cache hit rates: "
+                + ", ".join(f"{source} {rate:.0%}" for source, rate in hit_rates.items())
+            )
 
         return all_offers
 
-    def __del__(self):
-        """Cleanup executor on deletion."""
-        if hasattr(self, 'executor'):
-            self.executor.shutdown(wait=False)
\ No newline at end of file
+    async def _scrape_urls(
+            self,
+            source: str,
+            urls: List[str],
+            is_seen: Optional[Callable[[Offer], bool]] = None
+    ) -> Dict[str, List[Offer]]:
+        """Scrape source's URLs one after another, collecting cycle stats."""
+        self.stats[source] = ScrapeStats()
+        self._pending_pages.pop(source, None)
+        return {url: await self._timed_scrape(source, url, is_seen) for url in urls}
+
+    async def _timed_scrape(
+            self,
+            source: str,
+            url: str,
+            is_seen: Optional[Callable[[Offer], bool]] = None
+    ) -> List[Offer]:
+        """Scrape source, adding how long it took to the cycle's latency."""
+        start = time.perf_counter()
+        try:
+            return await self.scrape_source(source, url, is_seen)
+        finally:
+            self.stats.setdefault(source, ScrapeStats()).seconds += time.perf_counter() - start
+
+    async def close(self) -> None:
+        """Close shared HTTP session and parse workers."""
+        await http_client.close()
+        if self.parse_executor:
+            self.parse_executor.shutdown(wait=False, cancel_futures=True)
\ No newline at end of file
@@ -0,0 +1,59 @@
+"""Rolling multi-day set of seen offer keys."""
+from datetime import date, timedelta
+from typing import Dict, Iterable, Iterator, Set, Tuple
+
+
+class SeenSet:
+    """Offer keys seen within a rolling window, kept in per-day buckets.
+
+    Whole days expire at once. A reference count per key keeps lookups O(1)
+    while letting the same offer appear in several buckets.
+    """
+
+    def __init__(self, window_days: int):
+        """Initialize seen-set spanning given number of days."""
+        self.window_days = window_days
+        self._buckets: Dict[date, Set[int]] = {}
+        self._counts: Dict[int, int] = {}
+
+    def __contains__(self, key: int) -> bool:
+        """Check if key was seen within the window."""
+        return key in self._counts
+
+    def __len__(self) -> int:
+        """Number of distinct keys within the window."""
+        return len(self._counts)
+
+    @property
+    def first_day(self) -> date:
+        """Oldest day still covered by the window."""
+        return date.today() - timedelta(days=self.window_days - 1)
+
+    def buckets(self) -> Iterator[Tuple[date, Set[int]]]:
+        """Get (day, keys) pairs of buckets within the window."""
+        first_day = self.first_day
+        return ((day, keys) for day, keys in self._buckets.items() if day >= first_day)
+
+    def add(self, key: int, day: date = None) -> None:
+        """Add key to the bucket of given day (default: today)."""
+        bucket = self._buckets.setdefault(day or date.today(), set())
+        if key not in bucket:
+            bucket.add(key)
+            self._counts[key] = self._counts.get(key, 0) + 1
+
+    def add_many(self, keys: Iterable[int], day: date = None) -> None:
+        """Add keys to the bucket of given day (default: today)."""
+        for key in keys:
+            self.add(key, day)
+
+    def evict_expired(self) -> int:
+        """Drop buckets older than the window, returning number of expired days."""
+        expired = [day for day in self._buckets if day < self.first_day]
+        for day in expired:
+            for key in self._buckets.pop(day):
+                remaining = self._counts[key] - 1
+                if remaining:
+                    self._counts[key] = remaining
+                else:
+                    del self._counts[key]
+        return len(expired)
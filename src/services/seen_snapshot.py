@@ -0,0 +1,78 @@
+"""Binary snapshot of the seen-set for fast warm starts."""
+import json
+import logging
+import struct
+import sys
+from array import array
+from datetime import date
+from typing import Any, Dict, Optional, Tuple
+
+from src.services.seen_set import SeenSet
+from src.config.settings import settings
+
+_MAGIC = b"SEENSET1"
+# Magic, length of the JSON log position that follows, number of day buckets
+_HEADER = struct.Struct(">8sII")
+# Day ordinal, number of keys that follow
+_BUCKET = struct.Struct(">II")
+
+
+class SeenSnapshot:
+    """Seen-set written as sorted 64-bit key arrays per day, plus the log position it covers."""
+
+    def __init__(self, filename: str = "seen_snapshot.bin"):
+        """Initialize snapshot file location."""
+        self.path = settings.data_dir / filename
+        self.logger = logging.getLogger(__name__)
+
+    @staticmethod
+    def _to_big_endian(keys: array) -> array:
+        """Byte-swap key array on little-endian machines (in place)."""
+        if sys.byteorder == "little":
+            keys.byteswap()
+        return keys
+
+    def load(self) -> Optional[Tuple[Dict[date, array], Any]]:
+        """Load (day -> keys, log position) or None when there is no usable snapshot."""
+        try:
+            data = self.path.read_bytes()
+            magic, position_size, bucket_count = _HEADER.unpack_from(data, 0)
+            if magic != _MAGIC:
+                raise ValueError("unknown snapshot format")
+
+            offset = _HEADER.size
+            position = json.loads(data[offset:offset + position_size])
+            offset += position_size
+
+            buckets = {}
+            for _ in range(bucket_count):
+                ordinal, count = _BUCKET.unpack_from(data, offset)
+                offset += _BUCKET.size
+                keys = array("Q")
+                keys.frombytes(data[offset:offset + 8 * count])
+                offset += 8 * count
+                buckets[date.fromordinal(ordinal)] = self._to_big_endian(keys)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, struct.error) as e:
+            self.logger.warning(f"Ignoring unreadable seen-set snapshot: {e}")
+            return None
+
+        return buckets, position
+
+    def save(self, seen_set: SeenSet, position: Any) -> None:
+        """Write snapshot of seen-set covering the offer log up to position."""
+        position_bytes = json.dumps(position).encode("utf-8")
+        buckets = list(seen_set.buckets())
+
+        chunks = [_HEADER.pack(_MAGIC, len(position_bytes), len(buckets)), position_bytes]
+        for day, keys in buckets:
+            chunks.append(_BUCKET.pack(day.toordinal(), len(keys)))
+            chunks.append(self._to_big_endian(array("Q", sorted(keys))).tobytes())
+
+        tmp_path = self.path.with_suffix(".tmp")
+        try:
+            tmp_path.write_bytes(b"".join(chunks))
+            tmp_path.replace(self.path)
+        except OSError as e:
+            self.logger.error(f"Failed to save seen-set snapshot: {e}")
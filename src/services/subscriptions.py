@@ -0,0 +1,108 @@
+"""Subscriptions grouped into shared marketplace queries."""
+import json
+import logging
+from typing import Dict, List, Optional, Set, Tuple
+
+from src.models.offer import Offer
+from src.models.subscription import SearchQuery, Subscription
+from src.config.settings import settings
+
+
+def load_subscriptions(path: str) -> List[Subscription]:
+    """Load subscriptions from JSON list of objects.
+
+    Missing search parameters default to the global settings.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        entries = json.load(f)
+
+    return [
+        Subscription(
+            name=entry.get("name") or f"subscription-{index + 1}",
+            location=entry.get("location", settings.search_location),
+            radius_km=int(entry.get("radius_km", settings.search_radius_km)),
+            max_price=int(entry.get("max_price", settings.max_price)),
+            channel_id=int(entry["channel_id"]) if entry.get("channel_id") else None,
+            webhook_url=entry.get("webhook_url")
+        )
+        for index, entry in enumerate(entries)
+    ]
+
+
+class SubscriptionRegistry:
+    """Maps subscriptions onto the distinct marketplace queries that serve them.
+
+    Subscriptions for the same location and radius share one query, fetched
+    with the highest price limit among them; each then filters offers by its
+    own limit, so fetch cost grows with distinct queries, not subscribers.
+    """
+
+    def __init__(self, subscriptions: List[Subscription]):
+        """Initialize registry and group subscriptions into queries."""
+        self.logger = logging.getLogger(__name__)
+        self.subscriptions = subscriptions
+        self._targets = {subscription.target for subscription in subscriptions}
+        groups: Dict[Tuple[str, int], List[Subscription]] = {}
+        for subscription in subscriptions:
+            groups.setdefault(subscription.group_key, []).append(subscription)
+
+        self._groups: Dict[SearchQuery, List[Subscription]] = {
+            SearchQuery(
+                location=members[0].location,
+                radius_km=members[0].radius_km,
+                max_price=max(member.max_price for member in members)
+            ): members
+            for members in groups.values()
+        }
+        self.logger.info(
+            f"{len(subscriptions)} subscriptions served by {len(self._groups)} queries"
+        )
+
+    @classmethod
+    def from_settings(cls) -> "SubscriptionRegistry":
+        """Load subscriptions file, or subscribe the default channel to the global search."""
+        if settings.subscriptions_file:
+            return cls(load_subscriptions(settings.subscriptions_file))
+        return cls([Subscription(
+            name="default",
+            location=settings.search_location,
+            radius_km=settings.search_radius_km,
+            max_price=settings.max_price
+        )])
+
+    def queries(self) -> List[SearchQuery]:
+        """Get distinct queries to fetch each cycle."""
+        return list(self._groups)
+
+    def all_targets(self) -> Set[Optional[str]]:
+        """Get delivery targets of all subscriptions."""
+        return self._targets
+
+    def targets(self, query: SearchQuery, offer: Offer) -> Set[Optional[str]]:
+        """Get delivery targets of query's subscriptions that offer matches."""
+        return {
+            subscription.target
+            for subscription in self._groups.get(query, [])
+            if subscription.matches(offer)
+        }
+
+    def route(
+            self,
+            offers_by_query: Dict[SearchQuery, List[Offer]]
+    ) -> Tuple[List[Offer], Dict[int, Set[Optional[str]]]]:
+        """Merge offers fetched for several queries and map each offer key to its targets.
+
+        Offers matching no subscription are left out.
+        """
+        offers, targets = [], {}
+        for query, query_offers in offers_by_query.items():
+            for offer in query_offers:
+                matched = self.targets(query, offer)
+                if not matched:
+                    continue
+                key = offer.unique_key
+                if key not in targets:
+                    targets[key] = set()
+                    offers.append(offer)
+                targets[key] |= matched
+        return offers, targets
@@ -1,30 +1,83 @@
 """Base storage interface."""
 from abc import ABC, abstractmethod
-from typing import Set, List
+from typing import Any, Callable, Dict, Optional, Set, List, Tuple
 from datetime import date
 
 from src.models.offer import Offer
 
 
 class BaseStorage(ABC):
-    """Abstract base class for offer storage."""
+    """Abstract base class for offer storage.
+
+    Each row records an offer delivered to one target; key loaders return
+    seen-set keys built by history_key.
+    """
 
     @abstractmethod
-    async def load_offers(self, for_date: date = None) -> Set[tuple[str, str]]:
-        """Load offers for given date (default: today)."""
+    async def load_offers(self, for_date: date = None) -> Set[int]:
+        """Load offer keys for given date (default: today)."""
         pass
 
     @abstractmethod
-    async def save_offer(self, offer: Offer) -> None:
-        """Save single offer."""
+    async def load_offer_history(self, since: date) -> Dict[date, Set[int]]:
+        """Load offer keys grouped by day, from given date until today."""
         pass
 
+    async def load_history_tail(
+            self,
+            since: date,
+            position: Any = None
+    ) -> Tuple[Dict[date, Set[int]], Any]:
+        """Load offer keys saved after log position, with the position they reach.
+
+        Storages without log positions return the whole history and None.
+        """
+        return await self.load_offer_history(since), None
+
+    async def log_position(self) -> Any:
+        """Get JSON-serializable position of the end of the offer log, if supported."""
+        return None
+
     @abstractmethod
-    async def save_offers(self, offers: List[Offer]) -> None:
-        """Save multiple offers."""
+    async def load_recent_offers(self, since: date) -> List[Offer]:
+        """Load offers saved from given date until today."""
+        pass
+
+    @abstractmethod
+    async def save_offer(self, offer: Offer, target: Optional[str] = None) -> None:
+        """Save single offer delivered to target."""
+        pass
+
+    @abstractmethod
+    async def save_offers(self, offers: List[Offer], target: Optional[str] = None) -> None:
+        """Save multiple offers delivered to target."""
+        pass
+
+    async def import_offers(self, day: date, offers: List[Offer], target: Optional[str] = None) -> None:
+        """Bulk-load offers as saved on given day (history imports and benchmarks)."""
+        raise NotImplementedError(f"{type(self).__name__} can't import offers")
+
+    async def migrate_keys(self, key_for_row: Callable[[dict], int]) -> None:
+        """Add offer keys to history stored before keys existed."""
         pass
 
     @abstractmethod
     async def cleanup_old_offers(self, days_to_keep: int = 7) -> None:
         """Remove offers older than specified days."""
-        pass
\ No newline at end of file
+        pass
+
+    async def initialize(self) -> None:
+        """Start background work of storage, if any."""
+        pass
+
+    async def flush(self) -> None:
+        """Write buffered offers to storage."""
+        pass
+
+    async def sync(self) -> None:
+        """Force saved offers to stable storage."""
+        pass
+
+    async def close(self) -> None:
+        """Release resources held by storage."""
+        pass
@@ -0,0 +1,195 @@
+"""Write-behind buffer coalescing offer saves into group commits."""
+import asyncio
+import logging
+import time
+from datetime import date
+from typing import Any, Callable, Dict, Optional, Set, List, Tuple
+
+from src.storage.base import BaseStorage
+from src.models.offer import Offer
+
+# Durability policies: when flushed batches are forced to stable storage
+DURABILITY_FLUSH = "flush"          # leave syncing to the OS
+DURABILITY_FSYNC = "fsync"          # sync after every flushed batch
+DURABILITY_INTERVAL = "interval"    # sync at most once per fsync interval
+
+
+class BufferedStorage(BaseStorage):
+    """Storage wrapper that buffers saves and writes them in one batch.
+
+    Saves from all sources are flushed together at the end of a fetch cycle,
+    when the oldest buffered offer exceeds max_delay_seconds, before reads,
+    and on close. A background task started by initialize enforces the delay
+    and the fsync interval between writes too.
+    """
+
+    def __init__(
+            self,
+            storage: BaseStorage,
+            max_delay_seconds: float = 60.0,
+            durability: str = DURABILITY_FLUSH,
+            fsync_interval_seconds: float = 30.0
+    ):
+        """Initialize buffer in front of storage."""
+        if durability not in (DURABILITY_FLUSH, DURABILITY_FSYNC, DURABILITY_INTERVAL):
+            raise ValueError(f"Unknown durability policy: {durability}")
+
+        self.storage = storage
+        self.max_delay_seconds = max_delay_seconds
+        self.durability = durability
+        self.fsync_interval_seconds = fsync_interval_seconds
+        self.logger = logging.getLogger(__name__)
+        self.lock = asyncio.Lock()
+        # (offer, delivery target) pairs in save order
+        self._pending: List[Tuple[Offer, Optional[str]]] = []
+        self._pending_since: float = None
+        self._last_sync = time.monotonic()
+        self._unsynced = False
+        self._timer: asyncio.Task = None
+        self._closed = False
+
+    def __len__(self) -> int:
+        """Number of buffered offers."""
+        return len(self._pending)
+
+    async def load_offers(self, for_date: date = None) -> Set[int]:
+        """Load offer keys for given date."""
+        await self.flush()
+        return await self.storage.load_offers(for_date)
+
+    async def load_offer_history(self, since: date) -> Dict[date, Set[int]]:
+        """Load offer keys grouped by day, from given date until today."""
+        await self.flush()
+        return await self.storage.load_offer_history(since)
+
+    async def load_history_tail(
+            self,
+            since: date,
+            position: Any = None
+    ) -> Tuple[Dict[date, Set[int]], Any]:
+        """Load offer keys saved after log position."""
+        await self.flush()
+        return await self.storage.load_history_tail(since, position)
+
+    async def log_position(self) -> Any:
+        """Get position of the end of the offer log, buffered offers included."""
+        await self.flush()
+        return await self.storage.log_position()
+
+    async def load_recent_offers(self, since: date) -> List[Offer]:
+        """Load offers saved from given date until today."""
+        await self.flush()
+        return await self.storage.load_recent_offers(since)
+
+    async def save_offer(self, offer: Offer, target: Optional[str] = None) -> None:
+        """Buffer single offer delivered to target."""
+        await self.save_offers([offer], target)
+
+    async def save_offers(self, offers: List[Offer], target: Optional[str] = None) -> None:
+        """Buffer offers delivered to target, flushing if the oldest waits longer than allowed."""
+        if not offers:
+            return
+
+        if not self._pending:
+            self._pending_since = time.monotonic()
+        self._pending.extend((offer, target) for offer in offers)
+
+        if time.monotonic() - self._pending_since >= self.max_delay_seconds:
+            await self.flush()
+
+    async def import_offers(self, day: date, offers: List[Offer], target: Optional[str] = None) -> None:
+        """Flush buffer, then bulk-load offers delivered to target as saved on given day."""
+        await self.flush()
+        await self.storage.import_offers(day, offers, target)
+
+    async def flush(self) -> None:
+        """Write buffered offers to storage in one batch per delivery target."""
+        async with self.lock:
+            if not self._pending:
+                return
+
+            batch, self._pending = self._pending, []
+            by_target: Dict[Optional[str], List[Offer]] = {}
+            for offer, target in batch:
+                by_target.setdefault(target, []).append(offer)
+
+            written = set()
+            try:
+                for target, offers in by_target.items():
+                    await self.storage.save_offers(offers, target)
+                    written.add(target)
+            except Exception:
+                # Keep unwritten offers for the next flush rather than losing them
+                self._pending = [item for item in batch if item[1] not in written] + self._pending
+                raise
+
+            self.logger.debug(f"Flushed {len(batch)} offers")
+            self._pending_since = time.monotonic() if self._pending else None
+
+            now = time.monotonic()
+            if self.durability == DURABILITY_FSYNC or (
+                    self.durability == DURABILITY_INTERVAL
+                    and now - self._last_sync >= self.fsync_interval_seconds
+            ):
+                await self.storage.sync()
+                self._last_sync = now
+                self._unsynced = False
+            else:
+                self._unsynced = True
+
+    async def sync(self) -> None:
+        """Flush buffer and force saved offers to stable storage."""
+        await self.flush()
+        await self.storage.sync()
+        self._last_sync = time.monotonic()
+        self._unsynced = False
+
+    async def initialize(self) -> None:
+        """Start timer flushing and syncing the buffer on a quiet log."""
+        await self.storage.initialize()
+        if self._timer is None:
+            self._timer = asyncio.create_task(self._flush_periodically())
+
+    async def _flush_periodically(self) -> None:
+        """Enforce max delay and fsync interval even when no saves arrive."""
+        delays = [self.max_delay_seconds]
+        if self.durability == DURABILITY_INTERVAL:
+            delays.append(self.fsync_interval_seconds)
+        tick = max(min(delays) / 2, 1.0)
+
+        while True:
+            await asyncio.sleep(tick)
+            try:
+                now = time.monotonic()
+                if self._pending and now - self._pending_since >= self.max_delay_seconds:
+                    await self.flush()
+                if (
+                        self.durability == DURABILITY_INTERVAL
+                        and self._unsynced
+                        and now - self._last_sync >= self.fsync_interval_seconds
+                ):
+                    await self.sync()
+            except Exception as e:
+                self.logger.error(f"Background flush failed: {e}")
+
+    async def migrate_keys(self, key_for_row: Callable[[dict], int]) -> None:
+        """Add offer keys to history stored before keys existed."""
+        await self.storage.migrate_keys(key_for_row)
+
+    async def cleanup_old_offers(self, days_to_keep: int = 7) -> None:
+        """Remove offers older than specified days."""
+        await self.flush()
+        await self.storage.cleanup_old_offers(days_to_keep)
+
+    async def close(self) -> None:
+        """Stop timer, drain buffer durably, then close storage."""
+        if self._closed:
+            return
+        if self._timer is not None:
+            self._timer.cancel()
+            await asyncio.gather(self._timer, return_exceptions=True)
+            self._timer = None
+
+        await self.sync()
+        await self.storage.close()
+        self._closed = True
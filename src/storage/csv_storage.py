@@ -1,116 +1,335 @@
 """CSV-based storage implementation."""
 import csv
+import io
+import json
+import logging
 import os
 from datetime import date, datetime, timedelta
-from typing import Set, List
+from typing import Any, Callable, Dict, Iterator, Optional, Set, List, Tuple
 from pathlib import Path
 import asyncio
 import aiofiles
 import aiofiles.os
 
 from src.storage.base import BaseStorage
-from src.models.offer import Offer
+from src.models.offer import Offer, history_key, normalize_source
 from src.config.settings import settings
 
 
+FIELDNAMES = ["date", "title", "price", "url", "source", "publication_time", "key", "target"]
+
+# Columns of the single history file, whose oldest rows lack the key too
+LEGACY_FIELDNAMES = FIELDNAMES[:6]
+
+# Single history file used before the log was partitioned by day
+LEGACY_FILENAME = "offers.csv"
+
+# Partition sizes before an unfinished split of the legacy file, to roll it back
+MIGRATION_MARKER = "migration.json"
+
+
+def read_legacy_rows(path: Path) -> Iterator[dict]:
+    """Yield rows of single-file history, including rows written before keys existed."""
+    with open(path, "r", newline="", encoding="utf-8") as f:
+        lines = csv.reader(f)
+        header = next(lines, None) or []
+        # Rows were always appended in FIELDNAMES order, even under shorter headers
+        fieldnames = header if "key" in header else LEGACY_FIELDNAMES
+        for line in lines:
+            row = dict(zip(fieldnames, line))
+            if row.get("date"):
+                yield row
+
+
+def parse_partition(lines: Iterator[List[str]]) -> Iterator[dict]:
+    """Yield rows of day partition; rows written before the target column lack it.
+
+    Columns only ever get appended, so rows are read in FIELDNAMES order
+    whatever header the partition was created with.
+    """
+    next(lines, None)
+    for line in lines:
+        yield dict(zip(FIELDNAMES, line))
+
+
+def read_partition_rows(directory: Path) -> Iterator[dict]:
+    """Yield rows of all day partitions in date order."""
+    for path in sorted(directory.glob("????-??-??.csv")):
+        with open(path, "r", newline="", encoding="utf-8") as f:
+            yield from parse_partition(csv.reader(f))
+
+
 class CSVStorage(BaseStorage):
-    """CSV file storage implementation."""
+    """CSV file storage implementation.
+
+    History is an append-only log split into one file per day, listed in a
+    manifest, so loading a day reads one small file and retention deletes files.
+    """
 
-    def __init__(self, filename: str = "offers.csv"):
+    def __init__(self, dirname: str = "offers"):
         """Initialize CSV storage."""
-        self.filepath = settings.data_dir / filename
+        self.directory = settings.data_dir / dirname
+        self.directory.mkdir(exist_ok=True)
+        self.manifest_path = self.directory / "manifest.json"
+        self.legacy_path = settings.data_dir / LEGACY_FILENAME
+        self.marker_path = self.directory / MIGRATION_MARKER
+        self.logger = logging.getLogger(__name__)
         self.lock = asyncio.Lock()
-        self._ensure_file_exists()
+        # Partition day -> number of rows
+        self._partitions: Dict[date, int] = self._load_manifest()
+
+    def _partition_path(self, day: date) -> Path:
+        """Path of partition holding offers saved on given day."""
+        return self.directory / f"{day.isoformat()}.csv"
 
-    def _ensure_file_exists(self) -> None:
-        """Ensure CSV file exists with headers."""
-        if not self.filepath.exists():
-            with open(self.filepath, "w", newline="", encoding="utf-8") as f:
-                writer = csv.writer(f)
-                writer.writerow(["date", "title", "price", "url", "source", "publication_time"])
+    def _load_manifest(self) -> Dict[date, int]:
+        """Load partition list, rebuilding it from the directory if needed."""
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                return {date.fromisoformat(day): rows for day, rows in json.load(f).items()}
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Rebuilding unreadable partition manifest: {e}")
 
-    async def load_offers(self, for_date: date = None) -> Set[tuple[str, str]]:
-        """Load offers for given date."""
+        partitions = {}
+        for path in self.directory.glob("????-??-??.csv"):
+            with open(path, "r", newline="", encoding="utf-8") as f:
+                partitions[date.fromisoformat(path.stem)] = sum(1 for _ in csv.DictReader(f))
+        self._write_manifest(partitions)
+        return partitions
+
+    def _write_manifest(self, partitions: Dict[date, int]) -> None:
+        """Persist partition list atomically."""
+        tmp_path = self.manifest_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({day.isoformat(): rows for day, rows in sorted(partitions.items())}, f)
+        os.replace(tmp_path, self.manifest_path)
+
+    async def _read_partition(self, day: date) -> List[dict]:
+        """Read rows of one day partition."""
+        try:
+            async with aiofiles.open(self._partition_path(day), mode="r", encoding="utf-8", newline="") as f:
+                content = await f.read()
+        except FileNotFoundError:
+            self.logger.warning(f"Partition of {day} listed in manifest is missing")
+            return []
+        return list(parse_partition(csv.reader(io.StringIO(content, newline=""))))
+
+    async def _read_since(self, since: date, skip: Dict[str, int] = None) -> List[dict]:
+        """Read rows of partitions from given date until today, skipping rows already read."""
+        skip = skip or {}
+        async with self.lock:
+            rows = []
+            for day in sorted(day for day in self._partitions if day >= since):
+                already_read = skip.get(day.isoformat(), 0)
+                if self._partitions[day] > already_read:
+                    rows.extend((await self._read_partition(day))[already_read:])
+        return rows
+
+    async def load_offers(self, for_date: date = None) -> Set[int]:
+        """Load offer keys for given date."""
         if for_date is None:
             for_date = date.today()
 
-        offers = set()
-        date_str = for_date.isoformat()
-
         async with self.lock:
-            if not await aiofiles.os.path.exists(self.filepath):
-                return offers
+            if for_date not in self._partitions:
+                return set()
+            rows = await self._read_partition(for_date)
+        return {history_key(int(row["key"]), row.get("target")) for row in rows if row.get("key")}
 
-            async with aiofiles.open(self.filepath, mode="r", encoding="utf-8") as f:
-                content = await f.read()
+    async def load_offer_history(self, since: date) -> Dict[date, Set[int]]:
+        """Load offer keys grouped by day, from given date until today."""
+        history: Dict[date, Set[int]] = {}
+        for row in await self._read_since(since):
+            if row.get("key"):
+                history.setdefault(date.fromisoformat(row["date"]), set()).add(
+                    history_key(int(row["key"]), row.get("target"))
+                )
+        return history
 
-        # Process content synchronously
-        lines = content.strip().split('\n')
-        if len(lines) <= 1:  # Only header or empty
-            return offers
+    async def load_history_tail(
+            self,
+            since: date,
+            position: Any = None
+    ) -> Tuple[Dict[date, Set[int]], Any]:
+        """Load offer keys appended after position (rows read per partition)."""
+        skip = position if isinstance(position, dict) else None
+        history: Dict[date, Set[int]] = {}
+        for row in await self._read_since(since, skip):
+            if row.get("key"):
+                history.setdefault(date.fromisoformat(row["date"]), set()).add(
+                    history_key(int(row["key"]), row.get("target"))
+                )
+        return history, await self.log_position()
 
-        reader = csv.DictReader(lines)
-        for row in reader:
-            if row.get("date") == date_str:
-                offers.add((row["title"], row["price"]))
+    async def log_position(self) -> Any:
+        """Get number of rows in each partition."""
+        async with self.lock:
+            return {day.isoformat(): rows for day, rows in self._partitions.items()}
+
+    async def load_recent_offers(self, since: date) -> List[Offer]:
+        """Load offers saved from given date until today."""
+        return [
+            Offer(
+                title=row.get("title") or "",
+                price=row.get("price") or "",
+                url=row.get("url") or "",
+                publication_time=row.get("publication_time") or None,
+                source=normalize_source(row.get("source")) or None,
+                scraped_at=datetime.fromisoformat(row["date"])
+            )
+            for row in await self._read_since(since)
+        ]
 
-        return offers
+    async def save_offer(self, offer: Offer, target: Optional[str] = None) -> None:
+        """Save single offer delivered to target."""
+        await self.save_offers([offer], target)
 
-    async def save_offer(self, offer: Offer) -> None:
-        """Save single offer."""
-        await self.save_offers([offer])
+    async def save_offers(self, offers: List[Offer], target: Optional[str] = None) -> None:
+        """Append offers delivered to target to today's partition."""
+        await self.import_offers(date.today(), offers, target)
 
-    async def save_offers(self, offers: List[Offer]) -> None:
-        """Save multiple offers."""
+    async def import_offers(self, day: date, offers: List[Offer], target: Optional[str] = None) -> None:
+        """Append offers delivered to target to partition of given day."""
         if not offers:
             return
 
-        today_str = date.today().isoformat()
-        rows = []
-
+        buffer = io.StringIO(newline="")
+        writer = csv.writer(buffer)
         for offer in offers:
-            rows.append([
-                today_str,
+            writer.writerow([
+                day.isoformat(),
                 offer.title,
                 offer.price,
                 offer.url,
-                offer.source or "",
-                offer.publication_time or ""
+                normalize_source(offer.source),
+                offer.publication_time or "",
+                offer.unique_key,
+                target or ""
             ])
 
         async with self.lock:
-            async with aiofiles.open(self.filepath, mode="a", encoding="utf-8") as f:
-                for row in rows:
-                    await f.write(",".join(f'"{field}"' for field in row) + "\n")
+            await self._append(day, buffer.getvalue(), len(offers))
 
-    async def cleanup_old_offers(self, days_to_keep: int = 7) -> None:
-        """Remove offers older than specified days."""
-        cutoff_date = date.today() - timedelta(days=days_to_keep)
-        cutoff_str = cutoff_date.isoformat()
+    async def _append(self, day: date, content: str, count: int) -> None:
+        """Append CSV lines to day partition, creating it with a header if new."""
+        if day not in self._partitions:
+            header = io.StringIO(newline="")
+            csv.writer(header).writerow(FIELDNAMES)
+            content = header.getvalue() + content
+            self._partitions[day] = 0
+
+        async with aiofiles.open(self._partition_path(day), mode="a", encoding="utf-8", newline="") as f:
+            await f.write(content)
 
+        self._partitions[day] += count
+        await asyncio.to_thread(self._write_manifest, dict(self._partitions))
+
+    async def sync(self) -> None:
+        """Force today's partition and the manifest to disk."""
         async with self.lock:
-            if not await aiofiles.os.path.exists(self.filepath):
-                return
+            paths = [self.manifest_path]
+            if date.today() in self._partitions:
+                paths.append(self._partition_path(date.today()))
+            await asyncio.to_thread(self._fsync, paths)
 
-            # Read all content
-            async with aiofiles.open(self.filepath, mode="r", encoding="utf-8") as f:
-                content = await f.read()
+    @staticmethod
+    def _fsync(paths: List[Path]) -> None:
+        """Fsync given files."""
+        for path in paths:
+            with open(path, "rb") as f:
+                os.fsync(f.fileno())
 
-            lines = content.strip().split('\n')
-            if len(lines) <= 1:
-                return
+    async def migrate_keys(self, key_for_row: Callable[[dict], int]) -> None:
+        """Split single-file history into day partitions once, adding offer keys.
 
-            # Filter recent offers
-            header = lines[0]
-            recent_lines = [header]
+        A marker written before the first append lets a crashed split be rolled
+        back and redone instead of duplicating rows.
+        """
+        if not await aiofiles.os.path.exists(self.legacy_path):
+            # Legacy file was renamed, so a leftover marker belongs to a finished split
+            if await aiofiles.os.path.exists(self.marker_path):
+                await aiofiles.os.remove(self.marker_path)
+            return
 
-            reader = csv.DictReader(lines)
-            for row in reader:
-                if row.get("date", "") >= cutoff_str:
-                    # Reconstruct CSV line
-                    line = ",".join(f'"{row.get(field, "")}"' for field in reader.fieldnames)
-                    recent_lines.append(line)
+        days: Dict[date, io.StringIO] = {}
+        counts: Dict[date, int] = {}
+        for row in read_legacy_rows(self.legacy_path):
+            day = date.fromisoformat(row["date"])
+            key = int(row["key"]) if row.get("key") else key_for_row(row)
+            if day not in days:
+                days[day] = io.StringIO(newline="")
+                counts[day] = 0
+            # Without a target the row stands for delivery to every subscription
+            csv.writer(days[day]).writerow(
+                [row.get(field, "") for field in LEGACY_FIELDNAMES] + [key]
+            )
+            counts[day] += 1
+
+        async with self.lock:
+            await asyncio.to_thread(self._roll_back_migration)
+            marker = {
+                day.isoformat(): [
+                    self._partition_path(day).stat().st_size if day in self._partitions else -1,
+                    self._partitions.get(day, 0)
+                ]
+                for day in days
+            }
+            await asyncio.to_thread(self._write_marker, marker)
 
-            # Write back filtered content
-            async with aiofiles.open(self.filepath, mode="w", encoding="utf-8") as f:
-                await f.write("\n".join(recent_lines) + "\n")
\ No newline at end of file
+            for day, buffer in sorted(days.items()):
+                await self._append(day, buffer.getvalue(), counts[day])
+            await asyncio.to_thread(
+                self._fsync, [self.manifest_path] + [self._partition_path(day) for day in days]
+            )
+
+        # Keep the original file next to the partitions instead of deleting it
+        os.replace(self.legacy_path, self.legacy_path.with_suffix(".csv.migrated"))
+        await aiofiles.os.remove(self.marker_path)
+        self.logger.info(f"Split {sum(counts.values())} offers into {len(days)} day partitions")
+
+    def _write_marker(self, marker: Dict[str, List[int]]) -> None:
+        """Persist partition sizes before migration and force them to disk."""
+        tmp_path = self.marker_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(marker, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.marker_path)
+
+    def _roll_back_migration(self) -> None:
+        """Undo appends of a split that crashed before finishing."""
+        try:
+            with open(self.marker_path, "r", encoding="utf-8") as f:
+                marker = json.load(f)
+        except FileNotFoundError:
+            return
+
+        for day_str, (size, rows) in marker.items():
+            day = date.fromisoformat(day_str)
+            path = self._partition_path(day)
+            if size < 0:
+                path.unlink(missing_ok=True)
+                self._partitions.pop(day, None)
+            else:
+                os.truncate(path, size)
+                self._partitions[day] = rows
+        self._write_manifest(self._partitions)
+        self.marker_path.unlink()
+        self.logger.warning(f"Rolled back unfinished split of {len(marker)} day partitions")
+
+    async def cleanup_old_offers(self, days_to_keep: int = 7) -> None:
+        """Remove offers older than specified days by deleting their partitions."""
+        cutoff_date = date.today() - timedelta(days=days_to_keep)
+
+        async with self.lock:
+            expired = [day for day in self._partitions if day < cutoff_date]
+            for day in expired:
+                try:
+                    await aiofiles.os.remove(self._partition_path(day))
+                except FileNotFoundError:
+                    pass
+                del self._partitions[day]
+            if expired:
+                await asyncio.to_thread(self._write_manifest, dict(self._partitions))
@@ -0,0 +1,277 @@
+"""SQLite-based storage implementation."""
+import asyncio
+import itertools
+import logging
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, Optional, Set, List, Tuple
+
+from src.storage.base import BaseStorage
+from src.storage.csv_storage import LEGACY_FILENAME, read_legacy_rows, read_partition_rows
+from src.models.offer import Offer, history_key, normalize_source
+from src.config.settings import settings
+
+# user_version of a database that already holds the imported CSV history
+_SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS offers (
+    id INTEGER PRIMARY KEY,
+    date TEXT NOT NULL,
+    key INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    price TEXT NOT NULL,
+    price_value INTEGER,
+    url TEXT NOT NULL,
+    source TEXT,
+    listing_id TEXT,
+    publication_time TEXT,
+    target TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_offers_date ON offers (date);
+CREATE INDEX IF NOT EXISTS idx_offers_key ON offers (key);
+"""
+
+_INSERT = (
+    "INSERT INTO offers (date, key, title, price, price_value, url, source, listing_id, publication_time, target) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+
+def _to_db_key(key: int) -> int:
+    """Map unsigned 64-bit offer key onto SQLite's signed INTEGER."""
+    return key - (1 << 64) if key >= (1 << 63) else key
+
+
+def _from_db_key(value: int) -> int:
+    """Map stored INTEGER back onto unsigned offer key."""
+    return value + (1 << 64) if value < 0 else value
+
+
+class SQLiteStorage(BaseStorage):
+    """SQLite database storage implementation.
+
+    All database work runs on one dedicated thread owning the connection,
+    so queries never block the event loop and never race each other.
+    """
+
+    def __init__(self, filename: str = "offers.db", csv_dirname: str = "offers"):
+        """Initialize SQLite storage."""
+        self.filepath = settings.data_dir / filename
+        self.csv_path = settings.data_dir / LEGACY_FILENAME
+        self.csv_directory = settings.data_dir / csv_dirname
+        self.logger = logging.getLogger(__name__)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite")
+        self._conn: sqlite3.Connection = None
+        self._closed = False
+
+    async def _run(self, func: Callable, *args):
+        """Run function with the connection on the database thread."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._call, func, args)
+
+    def _call(self, func: Callable, args: tuple):
+        """Open connection on first use, then call function with it."""
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.filepath, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+            self._add_target_column(self._conn)
+        return func(self._conn, *args)
+
+    @staticmethod
+    def _add_target_column(conn: sqlite3.Connection) -> None:
+        """Add delivery target to databases created before it; their rows keep NULL."""
+        columns = {name for _, name, *_ in conn.execute("PRAGMA table_info(offers)")}
+        if "target" not in columns:
+            with conn:
+                conn.execute("ALTER TABLE offers ADD COLUMN target TEXT")
+
+    async def load_offers(self, for_date: date = None) -> Set[int]:
+        """Load offer keys for given date."""
+        if for_date is None:
+            for_date = date.today()
+
+        def query(conn):
+            rows = conn.execute("SELECT key, target FROM offers WHERE date = ?", (for_date.isoformat(),))
+            return {history_key(_from_db_key(key), target) for key, target in rows}
+
+        return await self._run(query)
+
+    async def load_offer_history(self, since: date) -> Dict[date, Set[int]]:
+        """Load offer keys grouped by day, from given date until today."""
+        def query(conn):
+            history: Dict[date, Set[int]] = {}
+            rows = conn.execute("SELECT date, key, target FROM offers WHERE date >= ?", (since.isoformat(),))
+            for row_date, key, target in rows:
+                history.setdefault(date.fromisoformat(row_date), set()).add(
+                    history_key(_from_db_key(key), target)
+                )
+            return history
+
+        return await self._run(query)
+
+    async def load_history_tail(
+            self,
+            since: date,
+            position: Any = None
+    ) -> Tuple[Dict[date, Set[int]], Any]:
+        """Load offer keys inserted after position (last row ID)."""
+        last_id = position if isinstance(position, int) else 0
+
+        def query(conn):
+            history: Dict[date, Set[int]] = {}
+            rows = conn.execute(
+                "SELECT id, date, key, target FROM offers WHERE id > ? AND date >= ?",
+                (last_id, since.isoformat())
+            )
+            new_last_id = last_id
+            for row_id, row_date, key, target in rows:
+                history.setdefault(date.fromisoformat(row_date), set()).add(
+                    history_key(_from_db_key(key), target)
+                )
+                new_last_id = max(new_last_id, row_id)
+            (max_id,) = conn.execute("SELECT COALESCE(MAX(id), 0) FROM offers").fetchone()
+            return history, max(new_last_id, max_id)
+
+        return await self._run(query)
+
+    async def log_position(self) -> Any:
+        """Get ID of the last inserted row."""
+        def query(conn):
+            (max_id,) = conn.execute("SELECT COALESCE(MAX(id), 0) FROM offers").fetchone()
+            return max_id
+
+        return await self._run(query)
+
+    async def load_recent_offers(self, since: date) -> List[Offer]:
+        """Load offers saved from given date until today."""
+        def query(conn):
+            rows = conn.execute(
+                "SELECT date, title, price, price_value, url, source, listing_id, publication_time "
+                "FROM offers WHERE date >= ? ORDER BY id",
+                (since.isoformat(),)
+            )
+            return [
+                Offer(
+                    title=title,
+                    price=price,
+                    url=url,
+                    publication_time=publication_time or None,
+                    source=source or None,
+                    scraped_at=datetime.fromisoformat(row_date),
+                    listing_id=listing_id,
+                    price_value=price_value
+                )
+                for row_date, title, price, price_value, url, source, listing_id, publication_time in rows
+            ]
+
+        return await self._run(query)
+
+    async def save_offer(self, offer: Offer, target: Optional[str] = None) -> None:
+        """Save single offer delivered to target."""
+        await self.save_offers([offer], target)
+
+    async def save_offers(self, offers: List[Offer], target: Optional[str] = None) -> None:
+        """Save multiple offers delivered to target in one transaction."""
+        await self.import_offers(date.today(), offers, target)
+
+    async def import_offers(self, day: date, offers: List[Offer], target: Optional[str] = None) -> None:
+        """Save offers delivered to target as saved on given day, in one transaction."""
+        if not offers:
+            return
+
+        day_str = day.isoformat()
+        rows = [
+            (
+                day_str,
+                _to_db_key(offer.unique_key),
+                offer.title,
+                offer.price,
+                offer.price_value,
+                offer.url,
+                normalize_source(offer.source),
+                offer.listing_id,
+                offer.publication_time or "",
+                target or ""
+            )
+            for offer in offers
+        ]
+
+        def insert(conn):
+            with conn:
+                conn.executemany(_INSERT, rows)
+
+        await self._run(insert)
+
+    async def sync(self) -> None:
+        """Checkpoint the WAL so committed offers are synced to the database file."""
+        def checkpoint(conn):
+            conn.execute("PRAGMA wal_checkpoint(FULL)")
+
+        await self._run(checkpoint)
+
+    async def migrate_keys(self, key_for_row: Callable[[dict], int]) -> None:
+        """Import CSV history into an empty database once."""
+        await self._run(self._import_csv, key_for_row)
+
+    def _import_csv(self, conn: sqlite3.Connection, key_for_row: Callable[[dict], int]) -> None:
+        """Copy rows of the CSV history (single file and day partitions), computing missing keys."""
+        (version,) = conn.execute("PRAGMA user_version").fetchone()
+        if version >= _SCHEMA_VERSION:
+            return
+
+        sources = []
+        if self.csv_path.exists():
+            sources.append(read_legacy_rows(self.csv_path))
+        if self.csv_directory.is_dir():
+            sources.append(read_partition_rows(self.csv_directory))
+
+        rows = []
+        for row in itertools.chain.from_iterable(sources):
+            key = int(row["key"]) if row.get("key") else key_for_row(row)
+            rows.append((
+                row["date"],
+                _to_db_key(key),
+                row.get("title") or "",
+                row.get("price") or "",
+                None,
+                row.get("url") or "",
+                normalize_source(row.get("source")),
+                None,
+                row.get("publication_time") or "",
+                row.get("target")
+            ))
+
+        with conn:
+            conn.executemany(_INSERT, rows)
+            conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+
+        if rows:
+            self.logger.info(f"Imported {len(rows)} offers from CSV history")
+
+    async def cleanup_old_offers(self, days_to_keep: int = 7) -> None:
+        """Remove offers older than specified days."""
+        cutoff_str = (date.today() - timedelta(days=days_to_keep)).isoformat()
+
+        def delete(conn):
+            with conn:
+                conn.execute("DELETE FROM offers WHERE date < ?", (cutoff_str,))
+
+        await self._run(delete)
+
+    async def close(self) -> None:
+        """Close connection and stop the database thread."""
+        if self._closed:
+            return
+
+        def close(conn):
+            conn.close()
+
+        if self._conn is not None:
+            await self._run(close)
+            self._conn = None
+        self._executor.shutdown(wait=True)
+        self._closed = True
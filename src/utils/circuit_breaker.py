@@ -0,0 +1,69 @@
+"""Circuit breaker for failing sources."""
+import logging
+import time
+from enum import Enum
+
+
+class CircuitState(str, Enum):
+    """Circuit breaker states."""
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Skip a failing source for a cooldown instead of hammering it."""
+
+    def __init__(self, name: str, failure_threshold: int = 3, cooldown_seconds: float = 1800.0):
+        """Initialize circuit breaker."""
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.logger = logging.getLogger(f"{__name__}.{name}")
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> CircuitState:
+        """Current state, moving from open to half-open once cooldown passed."""
+        if (
+            self._state == CircuitState.OPEN
+            and time.monotonic() - self._opened_at >= self.cooldown_seconds
+        ):
+            self._state = CircuitState.HALF_OPEN
+            self._probe_in_flight = False
+        return self._state
+
+    def allow_request(self) -> bool:
+        """Check whether a request may be sent now."""
+        state = self.state
+        if state == CircuitState.CLOSED:
+            return True
+        if state == CircuitState.HALF_OPEN and not self._probe_in_flight:
+            # Let exactly one probe through to test the source
+            self._probe_in_flight = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        """Record successful request."""
+        if self._state != CircuitState.CLOSED:
+            self.logger.info(f"Circuit for {self.name} closed")
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        """Record failed request."""
+        self._failures += 1
+        self._probe_in_flight = False
+
+        if self._state == CircuitState.HALF_OPEN or self._failures >= self.failure_threshold:
+            self._state = CircuitState.OPEN
+            self._opened_at = time.monotonic()
+            self.logger.warning(
+                f"Circuit for {self.name} opened for {self.cooldown_seconds:.0f}s "
+                f"after {self._failures} failures"
+            )
@@ -2,6 +2,7 @@
 import asyncio
 import functools
 import logging
+import random
 from typing import Callable, TypeVar, ParamSpec
 import time
 
@@ -47,9 +48,10 @@ def async_retry_on_failure(
         max_attempts: int = 3,
         delay: float = 1.0,
         backoff: float = 2.0,
-        exceptions: tuple = (Exception,)
+        exceptions: tuple = (Exception,),
+        jitter: bool = False
 ) -> Callable[[Callable[P, T]], Callable[P, T]]:
-    """Async version of retry_on_failure."""
+    """Async version of retry_on_failure with optional full jitter."""
     def decorator(func: Callable[P, T]) -> Callable[P, T]:
         @functools.wraps(func)
         async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
@@ -67,7 +69,9 @@ def async_retry_on_failure(
                     logger.warning(
                         f"{func.__name__} failed (attempt {attempt}/{max_attempts}): {e}"
                     )
-                    await asyncio.sleep(current_delay)
+                    await asyncio.sleep(
+                        random.uniform(0, current_delay) if jitter else current_delay
+                    )
                     current_delay *= backoff
                     attempt += 1
 
@@ -0,0 +1,15 @@
+"""JSON decoding with optional orjson acceleration."""
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+
+def loads(data: bytes | str) -> Any:
+    """Decode JSON document, using orjson when installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
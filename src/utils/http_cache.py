@@ -0,0 +1,102 @@
+"""On-disk cache of HTTP validators for conditional requests."""
+import json
+import logging
+import time
+from typing import Dict, Mapping
+
+from src.config.settings import settings
+
+
+class HttpValidatorCache:
+    """ETag / Last-Modified store used to turn unchanged pages into 304s."""
+
+    def __init__(self, filename: str = "http_cache.json"):
+        """Initialize validator cache."""
+        self.filepath = settings.data_dir / filename
+        self.logger = logging.getLogger(__name__)
+        self._entries: Dict[str, dict] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._dirty = False
+        self._load()
+
+    def _load(self) -> None:
+        """Load validators persisted by previous runs."""
+        if not self.filepath.exists():
+            return
+        try:
+            with open(self.filepath, "r", encoding="utf-8") as f:
+                self._entries = json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable HTTP cache: {e}")
+            self._entries = {}
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """Get If-None-Match / If-Modified-Since headers for URL."""
+        entry = self._entries.get(url)
+        if not settings.http_cache_enabled or not entry:
+            return {}
+
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store(self, url: str, response_headers: Mapping[str, str]) -> None:
+        """Remember validators sent with a full response."""
+        etag = response_headers.get("ETag")
+        last_modified = response_headers.get("Last-Modified")
+
+        if not etag and not last_modified:
+            if self._entries.pop(url, None) is not None:
+                self._dirty = True
+            return
+
+        self._entries[url] = {
+            "etag": etag,
+            "last_modified": last_modified,
+            "stored_at": time.time()
+        }
+        self._dirty = True
+
+    def record(self, source: str, hit: bool) -> None:
+        """Count conditional request outcome for source."""
+        stats = self._stats.setdefault(source, {"hits": 0, "misses": 0})
+        stats["hits" if hit else "misses"] += 1
+
+    def hit_rates(self) -> Dict[str, float]:
+        """Get share of requests answered with 304, per source."""
+        return {
+            source: stats["hits"] / (stats["hits"] + stats["misses"])
+            for source, stats in self._stats.items()
+            if stats["hits"] + stats["misses"]
+        }
+
+    def evict_expired(self) -> None:
+        """Drop validators older than configured max age."""
+        cutoff = time.time() - settings.http_cache_max_age_days * 86400
+        expired = [url for url, entry in self._entries.items() if entry.get("stored_at", 0) < cutoff]
+        for url in expired:
+            del self._entries[url]
+        if expired:
+            self._dirty = True
+
+    def save(self) -> None:
+        """Persist validators if they changed."""
+        self.evict_expired()
+        if not self._dirty:
+            return
+
+        tmp_path = self.filepath.with_suffix(".tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f)
+            tmp_path.replace(self.filepath)
+            self._dirty = False
+        except OSError as e:
+            self.logger.error(f"Failed to save HTTP cache: {e}")
+
+
+# Global validator cache instance
+http_cache = HttpValidatorCache()
@@ -0,0 +1,43 @@
+"""Shared async HTTP client."""
+import logging
+from typing import Optional
+import aiohttp
+
+from src.config.settings import settings
+
+
+class HttpClient:
+    """Pooled keep-alive HTTP session shared by all scrapers."""
+
+    def __init__(self):
+        """Initialize HTTP client."""
+        self.logger = logging.getLogger(__name__)
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def get_session(self) -> aiohttp.ClientSession:
+        """Get shared session, creating it on first use."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=settings.http_max_connections,
+                limit_per_host=settings.http_max_connections_per_host,
+                keepalive_timeout=settings.http_keepalive_seconds,
+                ttl_dns_cache=300
+            )
+            # gzip/deflate are always decoded, brotli when Brotli is installed
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=settings.http_timeout_seconds),
+                auto_decompress=True
+            )
+            self.logger.debug("Created pooled HTTP session")
+        return self._session
+
+    async def close(self) -> None:
+        """Close session and its connection pool."""
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+# Global HTTP client instance
+http_client = HttpClient()
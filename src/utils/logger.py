@@ -41,8 +41,7 @@ def setup_logging() -> None:
 
     # Reduce noise from libraries
     logging.getLogger("discord").setLevel(logging.WARNING)
-    logging.getLogger("urllib3").setLevel(logging.WARNING)
-    logging.getLogger("requests").setLevel(logging.WARNING)
+    logging.getLogger("aiohttp").setLevel(logging.WARNING)
 
 
 class DiscordLogger:
@@ -0,0 +1,62 @@
+"""Per-host token-bucket rate limiting."""
+import asyncio
+import time
+from typing import Dict
+from urllib.parse import urlsplit
+
+from src.config.settings import settings
+
+
+class TokenBucket:
+    """Token bucket allowing short bursts within a steady request rate."""
+
+    def __init__(self, rate: float, capacity: float):
+        """Initialize bucket with refill rate (tokens/s) and capacity."""
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        """Add tokens accumulated since last update."""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it."""
+        async with self._lock:
+            self._refill()
+            while self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+
+class HostRateLimiter:
+    """Keeps one token bucket per host shared by every request to it."""
+
+    def __init__(self, rate: float, capacity: float):
+        """Initialize rate limiter."""
+        self.rate = rate
+        self.capacity = capacity
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    async def acquire(self, url: str) -> None:
+        """Wait for permission to send request to URL's host."""
+        if self.rate <= 0:
+            return
+
+        host = urlsplit(url).hostname or ""
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = self._buckets[host] = TokenBucket(self.rate, self.capacity)
+        await bucket.acquire()
+
+
+# Global rate limiter instance
+rate_limiter = HostRateLimiter(
+    rate=settings.host_requests_per_minute / 60,
+    capacity=settings.host_request_burst
+)
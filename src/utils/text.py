@@ -0,0 +1,46 @@
+"""Text normalization helpers for offer titles and prices."""
+import re
+import unicodedata
+from typing import FrozenSet, Optional
+
+# Letters NFKD doesn't decompose into ASCII base + accent
+_TRANSLITERATION = str.maketrans({"ł": "l", "Ł": "L", "ø": "o", "ß": "ss"})
+
+_DECIMAL_POINT = re.compile(r"(?<=\d)[.,](?=\d)")
+_NON_ALNUM = re.compile(r"[^a-z0-9_]+")
+_PRICE = re.compile(r"\d[\d\s .]*(?:,\d{1,2})?")
+
+
+def normalize_title(title: str) -> str:
+    """Lowercase title, strip Polish diacritics and punctuation."""
+    decomposed = unicodedata.normalize("NFKD", title.translate(_TRANSLITERATION))
+    ascii_title = "".join(c for c in decomposed if not unicodedata.combining(c))
+    # Keep engine sizes like "1.6" as one token
+    joined = _DECIMAL_POINT.sub("_", ascii_title.lower())
+    return _NON_ALNUM.sub(" ", joined).strip()
+
+
+def title_shingles(title: str) -> FrozenSet[str]:
+    """Split title into word tokens and adjacent word pairs."""
+    tokens = normalize_title(title).split()
+    pairs = (f"{first} {second}" for first, second in zip(tokens, tokens[1:]))
+    return frozenset((*tokens, *pairs))
+
+
+def parse_price(text: Optional[str]) -> Optional[int]:
+    """Parse price text like "12 500 zł" or "12.500,00 PLN" into whole units."""
+    if not text:
+        return None
+
+    match = _PRICE.search(text)
+    if not match:
+        return None
+
+    whole = match.group().split(",")[0]
+    digits = re.sub(r"[\s .]", "", whole)
+    return int(digits) if digits else None
+
+
+def format_price(value: int) -> str:
+    """Format whole PLN amount the way marketplaces display it ("12 500 zł")."""
+    return f"{value:,}".replace(",", " ") + " zł"
@@ -0,0 +1,11 @@
+"""Shared test fixtures."""
+import pytest
+
+from src.config.settings import settings
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """Point the data directory at a fresh temporary directory."""
+    monkeypatch.setattr(settings, "data_dir", tmp_path)
+    return tmp_path
@@ -0,0 +1,103 @@
+"""Tests of outbox delivery."""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+discord = pytest.importorskip("discord")
+
+from src.bot.dispatcher import OutboxDispatcher
+from src.config.settings import settings
+from src.models.offer import Offer
+from src.services.outbox import Outbox
+
+
+def make_offer(listing_id: str) -> Offer:
+    """Build lento offer with given listing ID."""
+    return Offer(
+        title=f"Opel Astra {listing_id}",
+        price="9 000 zł",
+        url=f"https://siedlce.lento.pl/opel-astra,{listing_id}.html",
+        source="lento",
+        listing_id=listing_id,
+    )
+
+
+class RecordingOfferService:
+    """Offer service recording offers marked as sent."""
+
+    def __init__(self):
+        self.sent = []
+        self.storage = SimpleNamespace(flush=self._flush)
+
+    async def mark_as_sent(self, offers, target=None, delivered=True):
+        self.sent += [(offer.listing_id, target) for offer in offers]
+
+    async def _flush(self):
+        pass
+
+
+@pytest.fixture
+def fast_discord(data_dir, monkeypatch):
+    """Lift the message rate limit and backoff delays."""
+    monkeypatch.setattr(settings, "discord_messages_per_second", 1000.0)
+    monkeypatch.setattr(settings, "discord_message_burst", 1000)
+    monkeypatch.setattr(settings, "discord_retry_max_delay_seconds", 0)
+
+
+def rejected() -> discord.HTTPException:
+    """Discord response to an invalid message."""
+    return discord.HTTPException(SimpleNamespace(status=400, reason="Bad Request"), "Invalid Form Body")
+
+
+def test_rejected_batch_is_retried_one_by_one(fast_discord):
+    outbox = Outbox()
+    offer_service = RecordingOfferService()
+    messages = []
+
+    async def send_offers(offers, target):
+        ids = [offer.listing_id for offer in offers]
+        if "2" in ids:
+            raise rejected()
+        messages.append(ids)
+
+    async def scenario():
+        await outbox.put_offers([make_offer("1"), make_offer("2"), make_offer("3")])
+        dispatcher = OutboxDispatcher(outbox, offer_service, send_offers, None)
+        while len(outbox):
+            await dispatcher._dispatch_next()
+
+    asyncio.run(scenario())
+
+    # The bad offer is dropped alone; the rest are delivered one per message
+    assert messages == [["1"], ["3"]]
+    assert offer_service.sent == [("1", None), ("2", None), ("3", None)]
+    assert len(Outbox()) == 0
+
+
+def test_offer_marked_as_sent_per_target(fast_discord):
+    outbox = Outbox()
+    offer_service = RecordingOfferService()
+    offer = make_offer("1")
+    delivered = []
+
+    async def send_offers(offers, target):
+        delivered.append(target)
+
+    async def scenario():
+        await outbox.put_offers([offer], "123")
+        await outbox.put_offers([offer], "456")
+        dispatcher = OutboxDispatcher(outbox, offer_service, send_offers, None)
+
+        await dispatcher._dispatch_next()
+        assert delivered == ["123"]
+        assert offer_service.sent == [("1", "123")]
+        assert (offer.unique_key, "123") not in outbox
+        assert (offer.unique_key, "456") in outbox
+
+        await dispatcher._dispatch_next()
+        assert delivered == ["123", "456"]
+        assert offer_service.sent == [("1", "123"), ("1", "456")]
+        assert len(outbox) == 0
+
+    asyncio.run(scenario())
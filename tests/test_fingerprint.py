@@ -0,0 +1,58 @@
+"""Tests of listing page fingerprints."""
+from src.scrapers.lento import LentoScraper
+from src.scrapers.otomoto import OtomotoScraper
+
+
+def make_page(first_price: str, ad_price: str) -> bytes:
+    """Build Lento listing page with a financing ad around the cards."""
+    return f"""
+<html><body>
+<div class="banner">Kredyt od {ad_price} zł/mies</div>
+<div class="tablelist-tr">
+  <a class="title-list-item" href="https://siedlce.lento.pl/opel-astra,111.html">Opel Astra</a>
+  <span class="price-list-item">{first_price} zł</span>
+</div>
+<div class="tablelist-tr">
+  <a class="title-list-item" href="https://siedlce.lento.pl/ford-focus,222.html">Ford Focus</a>
+  <span class="price-list-item">12 000 zł</span>
+</div>
+<div class="recommended">Polecane: Fiat Punto {ad_price} zł</div>
+</body></html>
+""".encode()
+
+
+def test_fingerprint_ignores_prices_outside_listing():
+    scraper = LentoScraper()
+
+    assert scraper.fingerprint(make_page("9 500", "500")) == scraper.fingerprint(make_page("9 500", "650"))
+
+
+def test_fingerprint_changes_with_offer_price():
+    scraper = LentoScraper()
+
+    assert scraper.fingerprint(make_page("9 500", "500")) != scraper.fingerprint(make_page("8 900", "500"))
+
+
+def make_otomoto_page(price: str) -> bytes:
+    """Build Otomoto listing page whose cards split amount and currency."""
+    articles = "".join(
+        f"""
+<article data-id="{listing_id}">
+  <h2><a href="https://www.otomoto.pl/osobowe/oferta/opel-astra-ID{listing_id}.html">Opel Astra</a></h2>
+  <h3 data-sentry-element="Price" class="e1">{card_price}</h3>
+  <p data-sentry-element="PriceCurrency" class="e2">PLN</p>
+</article>"""
+        for listing_id, card_price in (("6A1b", price), ("6C2d", "11 000"))
+    )
+    return f"""
+<html><body>
+<aside>Finansowanie od 500 zł/mies</aside>
+<div data-testid="search-results">{articles}</div>
+</body></html>
+""".encode()
+
+
+def test_otomoto_fingerprint_changes_with_offer_price():
+    scraper = OtomotoScraper()
+
+    assert scraper.fingerprint(make_otomoto_page("12 500")) != scraper.fingerprint(make_otomoto_page("9 900"))
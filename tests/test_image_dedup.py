@@ -0,0 +1,93 @@
+"""Tests of thumbnail-based repost detection."""
+import asyncio
+import io
+
+from PIL import Image
+
+from src.models.offer import Offer
+from src.services.image_dedup import ImageDuplicateDetector, dhash
+
+
+def make_image(seed: int) -> bytes:
+    """Build small gradient PNG that hashes differently per seed."""
+    image = Image.new("L", (32, 32))
+    image.putdata([(x * seed + y * 7) % 256 for y in range(32) for x in range(32)])
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def make_offer(listing_id: str, thumbnail_url: str) -> Offer:
+    """Build lento offer with given thumbnail."""
+    return Offer(
+        title=f"Opel Astra {listing_id}",
+        price="9 000 zł",
+        url=f"https://siedlce.lento.pl/opel-astra,{listing_id}.html",
+        source="lento",
+        listing_id=listing_id,
+        thumbnail_url=thumbnail_url,
+    )
+
+
+def cache_thumbnail(detector: ImageDuplicateDetector, url: str, image_bytes: bytes) -> None:
+    """Seed thumbnail cache so no download happens."""
+    asyncio.run(detector.cache.put(url, image_bytes, dhash(image_bytes)))
+
+
+def test_offers_sharing_thumbnail_url_are_not_reposts(data_dir):
+    detector = ImageDuplicateDetector(window_days=14)
+    shared_url = "https://img.lento.pl/static/default.jpg"
+    cache_thumbnail(detector, shared_url, make_image(3))
+    first, second = make_offer("111", shared_url), make_offer("222", shared_url)
+
+    unique, duplicates = asyncio.run(detector.split_duplicates([first]))
+    assert unique == [first] and duplicates == []
+
+    unique, duplicates = asyncio.run(detector.split_duplicates([second]))
+    assert unique == [second] and duplicates == []
+
+
+def test_repost_with_reuploaded_photo_is_suppressed(data_dir):
+    detector = ImageDuplicateDetector(window_days=14)
+    image_bytes = make_image(5)
+    cache_thumbnail(detector, "https://img.lento.pl/111/1.jpg", image_bytes)
+    cache_thumbnail(detector, "https://img.lento.pl/222/1.jpg", image_bytes)
+    original = make_offer("111", "https://img.lento.pl/111/1.jpg")
+    repost = make_offer("222", "https://img.lento.pl/222/1.jpg")
+
+    asyncio.run(detector.split_duplicates([original]))
+    unique, duplicates = asyncio.run(detector.split_duplicates([repost]))
+
+    assert unique == [] and duplicates == [repost]
+
+
+def test_placeholder_thumbnails_are_ignored(data_dir):
+    detector = ImageDuplicateDetector(window_days=14)
+    offers = [make_offer(str(i), "data:image/gif;base64,R0lGODlhAQABAAAAACw=") for i in range(3)]
+
+    unique, duplicates = asyncio.run(detector.split_duplicates(offers))
+
+    assert unique == offers and duplicates == []
+
+
+def test_repost_let_through_is_indexed(data_dir):
+    detector = ImageDuplicateDetector(window_days=14)
+    image_bytes = make_image(5)
+    for listing_id in ("111", "222", "333"):
+        cache_thumbnail(detector, f"https://img.lento.pl/{listing_id}/1.jpg", image_bytes)
+    original, repost, second_repost = (
+        make_offer(listing_id, f"https://img.lento.pl/{listing_id}/1.jpg") for listing_id in ("111", "222", "333")
+    )
+    asyncio.run(detector.split_duplicates([original]))
+    seen = []
+
+    def keep(offer, original_key):
+        seen.append((offer.listing_id, original_key))
+        return False
+
+    unique, duplicates = asyncio.run(detector.split_duplicates([repost], keep))
+    assert unique == [repost] and duplicates == []
+    assert seen == [("222", original.unique_key)]
+
+    unique, duplicates = asyncio.run(detector.split_duplicates([second_repost]))
+    assert unique == [] and duplicates == [second_repost]
@@ -0,0 +1,24 @@
+"""Tests of Lento listing parsing."""
+from src.scrapers.lento import LentoScraper
+
+PAGE = """
+<html><body>
+<div class="ads">Reklama</div>
+<div class="tablelist-tr promoted">
+  <a class="title-list-item" href="https://siedlce.lento.pl/opel-astra,111.html">Opel Astra</a>
+  <span class="price-list-item">9 500 zł</span>
+</div>
+<div class="tablelist-tr">
+  <a class="title-list-item" href="https://siedlce.lento.pl/ford-focus,222.html">Ford Focus</a>
+  <span class="price-list-item">12 000 zł</span>
+</div>
+</body></html>
+""".encode()
+
+
+def test_parse_page_keeps_cards_with_extra_classes():
+    offers = LentoScraper().parse_page(PAGE)
+
+    assert [offer.title for offer in offers] == ["Opel Astra", "Ford Focus"]
+    assert [offer.listing_id for offer in offers] == ["111", "222"]
+    assert [offer.price_value for offer in offers] == [9500, 12000]
@@ -0,0 +1,62 @@
+"""Tests of the outbox journal."""
+import asyncio
+
+from src.models.offer import Offer
+from src.services.outbox import Outbox, KIND_OFFER, KIND_PRICE_DROP
+
+
+def make_offer(listing_id: str) -> Offer:
+    """Build lento offer with given listing ID."""
+    return Offer(
+        title=f"Opel Astra {listing_id}",
+        price="9 000 zł",
+        url=f"https://siedlce.lento.pl/opel-astra,{listing_id}.html",
+        source="lento",
+        listing_id=listing_id,
+    )
+
+
+def test_replay_skips_torn_line(data_dir):
+    outbox = Outbox()
+    asyncio.run(outbox.put_offers([make_offer("1"), make_offer("2")], "123"))
+    with open(outbox.path, "a", encoding="utf-8") as f:
+        f.write('{"op": "put", "id": 3, "kind": "of')
+
+    restored = Outbox()
+
+    assert len(restored) == 2
+    assert [entry.offer.listing_id for entry in restored.peek(10)] == ["1", "2"]
+    assert all(entry.target == "123" for entry in restored.peek(10))
+    # Entries queued after a torn line survive the next restart
+    asyncio.run(restored.put_offers([make_offer("3")], "123"))
+    assert [entry.id for entry in Outbox().peek(10)] == [1, 2, 3]
+
+
+def test_put_ack_and_compact(data_dir):
+    outbox = Outbox(compact_after=2)
+    first, second, third = make_offer("1"), make_offer("2"), make_offer("3")
+
+    async def scenario():
+        await outbox.put_offers([first, second])
+        await outbox.put_price_drop(third, 12000, "123")
+        assert (first.unique_key, None) in outbox
+        assert (first.unique_key, "123") not in outbox
+
+        batch = outbox.peek(10)
+        assert [entry.kind for entry in batch] == [KIND_OFFER, KIND_OFFER]
+        await outbox.ack(batch[:1])
+        # One ack stays in the journal until compaction
+        assert sum(1 for _ in open(outbox.path, encoding="utf-8")) == 4
+
+        await outbox.ack(batch[1:])
+        # Compacted down to the price drop still waiting
+        assert sum(1 for _ in open(outbox.path, encoding="utf-8")) == 1
+
+    asyncio.run(scenario())
+
+    restored = Outbox()
+    assert (first.unique_key, None) not in restored
+    [entry] = restored.peek(10)
+    assert entry.kind == KIND_PRICE_DROP
+    assert entry.old_price == 12000
+    assert entry.target == "123"
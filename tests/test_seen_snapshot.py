@@ -0,0 +1,61 @@
+"""Tests of seen-set snapshots and log tail replay."""
+import asyncio
+from datetime import date, timedelta
+
+from src.config.settings import settings
+from src.models.offer import Offer
+from src.services.offer_service import OfferService
+from src.services.seen_set import SeenSet
+from src.services.seen_snapshot import SeenSnapshot
+from src.storage.csv_storage import CSVStorage
+
+
+def make_offer(listing_id: str) -> Offer:
+    """Build lento offer with given listing ID."""
+    return Offer(
+        title=f"Opel Astra {listing_id}",
+        price="9 000 zł",
+        url=f"https://siedlce.lento.pl/opel-astra,{listing_id}.html",
+        source="lento",
+        listing_id=listing_id,
+    )
+
+
+def test_snapshot_round_trip(data_dir):
+    seen = SeenSet(window_days=14)
+    yesterday = date.today() - timedelta(days=1)
+    seen.add_many([1, 2, 2 ** 64 - 1], yesterday)
+    seen.add(3)
+
+    SeenSnapshot().save(seen, {"2026-10-17": 4})
+    buckets, position = SeenSnapshot().load()
+
+    assert sorted(buckets[yesterday]) == [1, 2, 2 ** 64 - 1]
+    assert list(buckets[date.today()]) == [3]
+    assert position == {"2026-10-17": 4}
+
+
+def test_warm_start_replays_log_after_snapshot(data_dir, monkeypatch):
+    monkeypatch.setattr(settings, "seen_snapshot", True)
+    monkeypatch.setattr(settings, "cross_source_dedup", False)
+    monkeypatch.setattr(settings, "image_dedup", False)
+    before, after, snapshot_only = make_offer("1"), make_offer("2"), make_offer("3")
+
+    async def run():
+        storage = CSVStorage()
+        await storage.save_offers([before])
+        seen = SeenSet(settings.seen_window_days)
+        seen.add_many([before.unique_key, snapshot_only.unique_key])
+        SeenSnapshot().save(seen, await storage.log_position())
+        await storage.save_offers([after])
+
+        service = OfferService(CSVStorage())
+        await service.refresh_cache()
+        return service
+
+    service = asyncio.run(run())
+
+    # Keys only in the snapshot prove it was loaded; the later save proves the tail was replayed
+    assert service.is_seen(snapshot_only)
+    assert service.is_seen(before)
+    assert service.is_seen(after)
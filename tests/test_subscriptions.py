@@ -0,0 +1,118 @@
+"""Tests of subscription routing and per-target delivery state."""
+import asyncio
+from datetime import date
+
+import pytest
+
+from src.config.settings import settings
+from src.models.offer import Offer
+from src.models.subscription import Subscription
+from src.services.offer_service import OfferService
+from src.services.subscriptions import SubscriptionRegistry
+from src.storage.csv_storage import CSVStorage
+
+
+def make_offer(source: str, listing_id: str, price: int) -> Offer:
+    """Build offer of the same car listed on given source."""
+    return Offer(
+        title="Opel Astra 1.6 benzyna 2012",
+        price=f"{price:,} zł".replace(",", " "),
+        url=f"https://{source}.pl/opel-astra-{listing_id}",
+        source=source,
+        listing_id=listing_id,
+        price_value=price,
+    )
+
+
+def subscribe(name: str, max_price: int, channel_id: int, location: str = "Siedlce") -> Subscription:
+    """Build subscription delivered to given channel."""
+    return Subscription(name=name, location=location, radius_km=50, max_price=max_price, channel_id=channel_id)
+
+
+@pytest.fixture
+def service(data_dir, monkeypatch):
+    """Offer service with cross-source deduplication only."""
+    monkeypatch.setattr(settings, "seen_snapshot", False)
+    monkeypatch.setattr(settings, "cross_source_dedup", True)
+    monkeypatch.setattr(settings, "image_dedup", False)
+    monkeypatch.setattr(settings, "price_drop_alerts", False)
+    return OfferService(CSVStorage())
+
+
+async def deliver(service: OfferService, registry: SubscriptionRegistry, offers: list) -> dict:
+    """Run one cycle the way the handler does, delivering at once; get listing IDs per target."""
+    await service.refresh_cache()
+    routed, targets = registry.route({query: offers for query in registry.queries()})
+    new_offers = service.filter_new_offers(routed, targets)
+    unique, duplicates = await service.split_cross_source_duplicates(new_offers, targets)
+
+    delivered = {}
+    for offer in unique:
+        for target in targets[offer.unique_key]:
+            delivered.setdefault(target, []).append(offer)
+    for target, target_offers in delivered.items():
+        await service.mark_as_sent(target_offers, target)
+    for offer, target in duplicates:
+        await service.mark_as_sent([offer], target, delivered=False)
+    return {target: [offer.listing_id for offer in target_offers] for target, target_offers in delivered.items()}
+
+
+def test_subscriptions_share_query_and_filter_by_own_price():
+    registry = SubscriptionRegistry([
+        subscribe("cheap", 10000, 1),
+        subscribe("any", 20000, 2),
+        subscribe("far", 20000, 3, location="Warszawa"),
+    ])
+    siedlce = next(query for query in registry.queries() if query.location == "Siedlce")
+    cheap, dear = make_offer("lento", "1", 9500), make_offer("lento", "2", 15000)
+
+    offers, targets = registry.route({siedlce: [cheap, dear, cheap]})
+
+    assert len(registry.queries()) == 2
+    assert siedlce.max_price == 20000
+    assert offers == [cheap, dear]
+    assert targets == {cheap.unique_key: {"1", "2"}, dear.unique_key: {"2"}}
+    assert registry.all_targets() == {"1", "2", "3"}
+
+
+def test_offer_sent_to_one_subscription_reaches_a_new_one(service):
+    offer = make_offer("lento", "1", 9500)
+    registry = SubscriptionRegistry([subscribe("first", 20000, 1), subscribe("second", 20000, 2)])
+
+    async def scenario():
+        assert await deliver(service, SubscriptionRegistry([subscribe("first", 20000, 1)]), [offer]) == {"1": ["1"]}
+        assert await deliver(service, registry, [offer]) == {"2": ["1"]}
+        assert await deliver(service, registry, [offer]) == {}
+
+    asyncio.run(scenario())
+
+
+def test_duplicate_suppressed_only_for_targets_that_got_original(service):
+    registry = SubscriptionRegistry([subscribe("cheap", 10000, 1), subscribe("any", 20000, 2)])
+    original = make_offer("otomoto", "6100000001", 10400)
+    repost = make_offer("lento", "1", 9900)
+
+    async def scenario():
+        assert await deliver(service, registry, [original]) == {"2": ["6100000001"]}
+        # The cheaper repost now fits the first subscription, which never saw the original
+        assert await deliver(service, registry, [repost]) == {"1": ["1"]}
+
+    asyncio.run(scenario())
+    assert service.is_seen(repost, "2")
+
+
+def test_history_saved_before_targets_counts_for_every_target(service):
+    offer = make_offer("lento", "1", 9500)
+    partition = settings.data_dir / "offers" / f"{date.today().isoformat()}.csv"
+    partition.write_text(
+        "date,title,price,url,source,publication_time,key\n"
+        f"{date.today().isoformat()},{offer.title},{offer.price},{offer.url},lento,,{offer.unique_key}\n",
+        encoding="utf-8"
+    )
+    # Rebuilt from the partitions on the next start
+    (settings.data_dir / "offers" / "manifest.json").unlink()
+    restarted = OfferService(CSVStorage())
+    registry = SubscriptionRegistry([subscribe("first", 20000, 1)])
+
+    assert asyncio.run(deliver(restarted, registry, [offer])) == {}
+    assert restarted.was_sent(offer, "1") and restarted.was_sent(offer, "2")